@@ -24,15 +24,6 @@ def aggregate_entities():
     logging.info(f"Project root: {PROJECT_ROOT}")
     logging.info(f"Looking for entity files in: {metadata_dir}")
     
-    # Debug: List all files in the directory
-    for root, dirs, files in os.walk(metadata_dir):
-        logging.info(f"\nExploring directory: {root}")
-        for d in dirs:
-            logging.info(f"  Dir: {d}")
-        for f in files:
-            if f.endswith('_entities.md'):
-                logging.info(f"  Entity file found: {f}")
-    
     # Initialize and run aggregator
     aggregator = EntityAggregator(metadata_dir)
     aggregator.aggregate_entities()
@@ -12,7 +12,10 @@ sys.path.append(PROJECT_ROOT)
 
 from utils.markdown.parser import parse_entity_table
 from utils.markdown.formatter import save_markdown_table
-from utils.text.processors import normalize_entity
+from utils.text.processors import normalize_entity_batch
+
+# Separator used to join the documents an entity appears in
+DOCUMENTS_SEPARATOR = ', '
 
 class EntityAggregator:
     def __init__(self, metadata_dir: str):
@@ -31,31 +34,18 @@ class EntityAggregator:
         Find all entity markdown files recursively in metadata directory.
         Looks for files ending with '_entities.md' in any subfolder.
         """
-        entity_files = []
-        
-        # Debug current working directory
-        logging.info(f"Current working directory: {os.getcwd()}")
         logging.info(f"Searching in: {self.metadata_dir}")
         
-        for root, dirs, files in os.walk(self.metadata_dir):
-            logging.debug(f"Scanning directory: {root}")
-            for file in files:
-                if file.endswith('_entities.md'):
-                    full_path = Path(root) / file
-                    relative_path = full_path.relative_to(self.metadata_dir)
-                    logging.info(f"Found entity file: {relative_path}")
-                    entity_files.append(full_path)
+        entity_files = list(self.metadata_dir.rglob('*_entities.md'))
         
         if not entity_files:
             logging.warning(f"No entity files found recursively in {self.metadata_dir}")
         else:
-            logging.info(f"Found {len(entity_files)} entity files:")
-            for f in entity_files:
-                logging.info(f"  {f.relative_to(self.metadata_dir)}")
+            logging.info(f"Found {len(entity_files)} entity files")
             
         return entity_files
 
-    def process_entity_file(self, file_path: Path) -> Optional[pd.DataFrame]:
+    def process_entity_file(self, file_path: Path) -> Optional[Dict[str, List[str]]]:
         """
         Process a single entity file.
         
@@ -63,17 +53,18 @@ class EntityAggregator:
             file_path: Path to entity markdown file
             
         Returns:
-            DataFrame with entities and document reference
+            Dict of column name -> values with entities and document reference
         """
         logging.info(f"Processing {file_path}")
         try:
             df = parse_entity_table(str(file_path))
             if df is not None:
                 logging.info(f"Found {len(df)} entities in {file_path.name}")
+                columns = {col: df[col].tolist() for col in df.columns}
                 # Add document reference and normalized entity name
-                df['Documents'] = file_path.name
-                df['Normalized Name'] = df['Entity Name'].apply(normalize_entity)
-                return df
+                columns['Documents'] = [file_path.name] * len(df)
+                columns['Normalized Name'] = normalize_entity_batch(df['Entity Name']).tolist()
+                return columns
             else:
                 logging.warning(f"No valid entity table found in {file_path}")
             
@@ -94,27 +85,46 @@ class EntityAggregator:
         
         logging.info(f"Processing {len(entity_files)} entity files...")
         
-        # Process all files
-        dfs = []
+        # Stream rows from all files into one set of columns
+        rows = {col: [] for col in ['Entity Type', 'Entity Name', 'First Context', 'Documents', 'Normalized Name']}
+        valid_files = 0
         for file_path in entity_files:
-            df = self.process_entity_file(file_path)
-            if df is not None:
-                dfs.append(df)
-        
-        if not dfs:
+            columns = self.process_entity_file(file_path)
+            if columns is not None:
+                num_rows = len(columns['Documents'])
+                for col, values in rows.items():
+                    values.extend(columns.get(col, [None] * num_rows))
+                valid_files += 1
+        
+        if not valid_files:
             logging.warning("No valid data found in any entity files")
             return
             
-        # Combine all dataframes
-        combined_df = pd.concat(dfs, ignore_index=True)
-        logging.info(f"Combined {len(dfs)} dataframes with total {len(combined_df)} rows")
+        # Build the combined dataframe once
+        combined_df = pd.DataFrame(rows)
+        logging.info(f"Combined {valid_files} files with total {len(combined_df)} rows")
+        
+        # Group on integer category codes rather than hashing strings per row
+        combined_df['Entity Type'] = combined_df['Entity Type'].astype('category')
+        combined_df['Normalized Name'] = combined_df['Normalized Name'].astype('category')
         
         # Group by Entity Type and normalized name
-        grouped = combined_df.groupby(['Entity Type', 'Normalized Name']).agg({
+        group_keys = ['Entity Type', 'Normalized Name']
+        grouped = combined_df.groupby(group_keys, observed=True).agg({
             'Entity Name': 'first',  # Keep original capitalization from first occurrence
-            'First Context': 'first',  # Keep first context seen
-            'Documents': lambda x: sorted(list(set(x)))  # Unique list of documents
-        }).reset_index()
+            'First Context': 'first'  # Keep first context seen
+        })
+        
+        # Unique, sorted documents per entity as the delimited string the markdown
+        # table shows, built without a per-group lambda
+        documents = (
+            combined_df.drop_duplicates(subset=group_keys + ['Documents'])
+            .sort_values('Documents', kind='stable')
+            .groupby(group_keys, observed=True)['Documents']
+            .agg(DOCUMENTS_SEPARATOR.join)
+        )
+        grouped['Documents'] = documents
+        grouped = grouped.reset_index()
         
         # Drop the normalized name column used for grouping
         grouped = grouped.drop('Normalized Name', axis=1)
@@ -2,33 +2,51 @@ import spacy
 import os
 import sys
 import re
-from typing import Dict, Set, Tuple
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Run the transformer on GPU when one is available (falls back to CPU otherwise)
+GPU_ENABLED = spacy.prefer_gpu()
+spacy.util.fix_random_seed(0)
+
+# Patterns used by clean_entity_text / normalize_entity, compiled once at import
+_RE_WS = re.compile(r'\s+')
+_RE_ART = re.compile(r'^(the|a|an)\s+', re.IGNORECASE)
+_RE_POSS = re.compile(r"'s$")
+_RE_PLURAL_POSS = re.compile(r"s'$")
+_RE_SUFFIX = re.compile(r"'s\s+(own|part|share|portion|division|subsidiary|segment)$", re.IGNORECASE)
+_RE_POSS_NORM = re.compile(r"'s?\b")
+_RE_CORP = re.compile(r'\b(inc|corp|corporation|ltd|limited|llc|llp|lp|plc)\b\.?$')
+
 def load_document(file_path):
+    # Read the bytes once and retry the decode on the same buffer
+    data = Path(file_path).read_bytes()
     try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            return file.read()
+        text = data.decode('utf-8')
     except UnicodeDecodeError:
-        with open(file_path, 'r', encoding='latin-1') as file:
-            return file.read()
+        text = data.decode('latin-1')
+    
+    # Match text-mode newline translation
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
 
 def clean_entity_text(text: str) -> str:
     """Cleans entity text while preserving original capitalization"""
     # Convert to single space and strip
-    text = ' '.join(text.split())
+    text = _RE_WS.sub(' ', text).strip()
     
     # Remove leading articles (the, a, an)
-    text = re.sub(r'^(the|a|an)\s+', '', text, flags=re.IGNORECASE)
+    text = _RE_ART.sub('', text)
     
     # Handle possessives
-    text = re.sub(r"'s$", '', text)  # Remove 's at the end
-    text = re.sub(r"s'$", 's', text)  # Handle plural possessives
+    text = _RE_POSS.sub('', text)  # Remove 's at the end
+    text = _RE_PLURAL_POSS.sub('s', text)  # Handle plural possessives
     
     # Remove common suffixes that might appear in financial docs
-    text = re.sub(r"'s\s+(own|part|share|portion|division|subsidiary|segment)$", '', text, flags=re.IGNORECASE)
+    text = _RE_SUFFIX.sub('', text)
     
     # Remove quotes and other common punctuation at ends
     text = text.strip('"\'.,;:()[]{}')
@@ -47,27 +65,32 @@ def chunk_text(text: str, chunk_size: int = 900000, overlap: int = 10000) -> lis
         end = start + chunk_size
         
         if end < text_length:
-            search_region = text[end-overlap:end+overlap]
-            break_chars = ['. ', '\n', '. \n']
-            
-            best_break = -1
-            for char in break_chars:
-                last_break = search_region.rfind(char)
-                if last_break > best_break:
-                    best_break = last_break
+            # Search the overlap window in place rather than slicing it out.
+            # A '. \n' break is always preceded by its own '\n', so two scans suffice.
+            lo, hi = end - overlap, min(end + overlap, text_length)
+            best_break = max(text.rfind('. ', lo, hi), text.rfind('\n', lo, hi))
             
             if best_break != -1:
-                end = end - overlap + best_break + 1
+                end = best_break + 1
             
         chunks.append(text[start:end])
         start = end
 
     return chunks
 
-def get_context(doc, start, end, window=5):
+def get_context(doc, start, end, window=5, text=None):
+    """
+    Get the whitespace-collapsed text of a token window around an entity.
+    Pass the document text when calling repeatedly, since doc.text is rebuilt
+    from the tokens on every access.
+    """
+    if text is None:
+        text = doc.text
     start_idx = max(0, start - window)
     end_idx = min(len(doc), end + window)
-    context = doc[start_idx:end_idx].text
+    # Slice the text by character offsets instead of materializing a Span
+    last_token = doc[end_idx - 1]
+    context = text[doc[start_idx].idx:last_token.idx + len(last_token)]
     return ' '.join(context.split())
 
 def normalize_entity(entity_text: str) -> str:
@@ -76,14 +99,13 @@ def normalize_entity(entity_text: str) -> str:
     text = entity_text.lower()
     
     # Remove all possessive forms
-    text = re.sub(r"'s?\b", '', text)
+    text = _RE_POSS_NORM.sub('', text)
     
     # Remove common corporate suffixes
-    text = re.sub(r'\b(inc|corp|corporation|ltd|limited|llc|llp|lp|plc)\b\.?$', '', text)
+    text = _RE_CORP.sub('', text)
     
     # Remove multiple spaces and trim
-    text = ' '.join(text.split())
-    text = text.strip()
+    text = _RE_WS.sub(' ', text).strip()
     
     return text
 
@@ -91,95 +113,105 @@ def entities_match(entity1: str, entity2: str) -> bool:
     """Compare two entities to see if they're effectively the same"""
     return normalize_entity(entity1) == normalize_entity(entity2)
 
-def process_chunk(nlp, text: str, existing_contexts: Dict) -> Tuple[Set, Dict]:
-    """Process a single chunk of text"""
-    entities = set()
-    normalized_to_original = {}  # Keep track of normalized -> original mapping
-    
-    doc = nlp(text)
-    target_types = {'PERSON', 'ORG', 'GPE', 'LOC', 'PRODUCT', 'EVENT', 'FAC'}
+TARGET_TYPES = frozenset({'PERSON', 'ORG', 'GPE', 'LOC', 'PRODUCT', 'EVENT', 'FAC'})
+
+def process_chunk(doc, index: Dict[Tuple[str, str], int], labels: List[str],
+                  names: List[str], contexts: List[str]) -> None:
+    """
+    Process a single spaCy-parsed chunk of text.
+    Unique entities are stored as parallel labels/names/contexts lists, with index
+    mapping (label, normalized text) to the entity's position in those lists.
+    """
+    text = doc.text
     
     for ent in doc.ents:
-        if ent.label_ in target_types:
+        if ent.label_ in TARGET_TYPES:
+            # Cleaning never lengthens text or adds non-digits, so obvious noise
+            # can be dropped before running the regex pipeline
+            raw_text = ent.text
+            if len(raw_text) <= 1 or raw_text.isdigit():
+                continue
+            
             # Clean the entity text while preserving case
-            original_text = clean_entity_text(ent.text)
+            original_text = clean_entity_text(raw_text)
             
             if len(original_text) <= 1 or original_text.isdigit():
                 continue
             
-            # Get normalized version for comparison
-            normalized_text = normalize_entity(original_text)
-            
-            # Check if we already have this entity (using normalized form)
-            existing_match = None
-            for existing_entity in entities:
-                if (existing_entity[0] == ent.label_ and 
-                    normalize_entity(existing_entity[1]) == normalized_text):
-                    existing_match = existing_entity
-                    break
-            
-            if existing_match:
-                entity_tuple = existing_match
-            else:
-                entity_tuple = (ent.label_, original_text)
-            
-            # Only store the first context we see for this entity
-            if entity_tuple not in existing_contexts:
-                context = get_context(doc, ent.start, ent.end)
-                existing_contexts[entity_tuple] = context
-            
-            entities.add(entity_tuple)
-    
-    return entities, existing_contexts
-
-def extract_entities(text: str):
-    nlp = spacy.load("en_core_web_trf")
-    
-    all_entities = set()
-    all_contexts = {}
+            # Keep the first spelling and context seen for each normalized entity
+            key = (ent.label_, normalize_entity(original_text))
+            if key not in index:
+                index[key] = len(labels)
+                labels.append(ent.label_)
+                names.append(original_text)
+                contexts.append(get_context(doc, ent.start, ent.end, text=text))
+
+# Only the transformer and ner pipes are needed for entity extraction
+UNUSED_PIPES = ["tagger", "parser", "lemmatizer", "attribute_ruler"]
+# GPU memory allows larger transformer batches than CPU
+GPU_BATCH_SIZE = 8
+CPU_BATCH_SIZE = 4
+
+_NLP = None
+
+def _get_nlp():
+    """Load the spaCy model once per process and reuse it across documents"""
+    global _NLP
+    if _NLP is None:
+        _NLP = spacy.load("en_core_web_trf", disable=UNUSED_PIPES)
+    return _NLP
+
+def extract_entities(text: str, batch_size: Optional[int] = None):
+    nlp = _get_nlp()
+    batch_size = batch_size or (GPU_BATCH_SIZE if GPU_ENABLED else CPU_BATCH_SIZE)
+    
+    index = {}
+    labels, names, contexts = [], [], []
     
     if len(text) > 900000:
         chunks = chunk_text(text)
         print(f"Processing {len(chunks)} chunks...")
-        
-        for i, chunk in enumerate(chunks, 1):
-            print(f"Processing chunk {i}/{len(chunks)}...")
-            chunk_entities, all_contexts = process_chunk(nlp, chunk, all_contexts)
-            all_entities.update(chunk_entities)
     else:
-        all_entities, all_contexts = process_chunk(nlp, text, all_contexts)
+        chunks = [text]
     
-    return all_entities, all_contexts
-
-def format_markdown_table(entities, contexts):
-    if not entities:
-        return "No entities found."
-        
-    markdown = "| Entity Type | Entity Name | First Context |\n"
-    markdown += "|------------|-------------|---------------|\n"
-    
-    sorted_entities = sorted(entities)
+    # Batch chunks through the pipeline so transformer passes aren't run one at a time
+    docs = nlp.pipe(chunks, batch_size=batch_size)
+    for i, doc in enumerate(docs, 1):
+        if len(chunks) > 1:
+            print(f"Processing chunk {i}/{len(chunks)}...")
+        process_chunk(doc, index, labels, names, contexts)
     
-    for entity in sorted_entities:
-        context = contexts.get(entity, "")
-        markdown += f"| {entity[0]} | {entity[1]} | {context} |\n"
+    return labels, names, contexts
+
+def markdown_table_lines(labels: List[str], names: List[str], contexts: List[str]) -> list:
+    if not labels:
+        return ["No entities found."]
     
-    return markdown
+    lines = [
+        "| Entity Type | Entity Name | First Context |\n",
+        "|------------|-------------|---------------|\n",
+    ]
+    lines.extend(
+        f"| {label} | {name} | {context} |\n"
+        for label, name, context in sorted(zip(labels, names, contexts))
+    )
+    return lines
+
+def format_markdown_table(labels: List[str], names: List[str], contexts: List[str]) -> str:
+    return ''.join(markdown_table_lines(labels, names, contexts))
 
-def export_results(entities: Set, contexts: Dict, output_file: Path) -> None:
+def export_results(labels: List[str], names: List[str], contexts: List[str], output_file: Path) -> None:
     """Export entities and contexts to a markdown file"""
     # Create output directory if it doesn't exist
-    output_dir = os.path.dirname(output_file)
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
+    os.makedirs(os.path.dirname(output_file), exist_ok=True)
     
     with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(format_markdown_table(entities, contexts))
+        f.writelines(markdown_table_lines(labels, names, contexts))
 
-def get_entity_type_counts(entities: Set) -> Dict:
+def get_entity_type_counts(labels: List[str]) -> Dict:
     """Get count of entities by type"""
     type_counts = {}
-    for entity_type, _ in entities:
+    for entity_type in labels:
         type_counts[entity_type] = type_counts.get(entity_type, 0) + 1
     return type_counts
 
@@ -199,17 +231,17 @@ def main():
         print(f"Document length: {len(text):,} characters")
     
         print("Extracting entities...")
-        entities, contexts = extract_entities(text)
+        labels, names, contexts = extract_entities(text)
         
         # Print entity counts by type
-        type_counts = get_entity_type_counts(entities)
+        type_counts = get_entity_type_counts(labels)
         print("\nEntity counts by type:")
         for entity_type, count in sorted(type_counts.items()):
             print(f"{entity_type}: {count:,}")
         
-        print(f"\nTotal unique entities found: {len(entities):,}")
+        print(f"\nTotal unique entities found: {len(labels):,}")
         print(f"Exporting results to {output_path}")
-        export_results(entities, contexts, output_path)
+        export_results(labels, names, contexts, output_path)
     else:
         print(f"Results already exist at {output_path}")
 
@@ -1,10 +1,14 @@
 import os
-import sys
+import queue
+import threading
 from collections import Counter
-from typing import Dict, Set
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
 
 # Import the functions we need from entity_extractor
 from extractor import (
+    GPU_ENABLED,
     extract_entities, 
     load_document, 
     export_results,
@@ -12,85 +16,181 @@ from extractor import (
     should_process_file
 )
 
-def process_sec_filings():
+# Approximate resident memory of one worker holding en_core_web_trf, and the
+# most workers started by default; each worker loads its own model copy
+WORKER_MEMORY_BYTES = 2 << 30
+MAX_DEFAULT_WORKERS = 4
+
+def _available_memory() -> Optional[int]:
+    """Bytes of free physical memory, or None where the platform can't say"""
+    try:
+        pages = os.sysconf('SC_AVPHYS_PAGES') if 'SC_AVPHYS_PAGES' in os.sysconf_names \
+            else os.sysconf('SC_PHYS_PAGES') // 2
+        return pages * os.sysconf('SC_PAGE_SIZE')
+    except (AttributeError, ValueError, OSError):
+        return None
+
+def default_max_workers() -> int:
+    """Worker processes to run, bounded by cores and by model memory"""
+    if GPU_ENABLED:
+        return 1
+    workers = min(MAX_DEFAULT_WORKERS, max(1, (os.cpu_count() or 2) // 2))
+    memory = _available_memory()
+    if memory is not None:
+        workers = min(workers, memory // WORKER_MEMORY_BYTES)
+    return max(1, workers)
+
+def _init_worker(num_threads: int) -> None:
+    """Give each worker's torch an even share of the cores instead of all of them"""
+    import torch
+    torch.set_num_threads(num_threads)
+
+def _process_filing(job: Tuple[str, str]) -> Tuple[str, Dict[str, int], int]:
+    """Extract and export entities for one filing; runs inside a worker process"""
+    file_path, output_file = job
+    text = load_document(file_path)
+    labels, names, contexts = extract_entities(text)
+    export_results(labels, names, contexts, output_file)
+    return os.path.basename(file_path), get_entity_type_counts(labels), len(labels)
+
+def _process_filings_pipelined(jobs: List[Tuple[str, str]]) -> Iterator[Tuple[str, Dict[str, int], int]]:
+    """
+    Process filings in this process, overlapping disk reads and writes with NER.
+    A reader thread prefetches the next documents and a writer thread exports
+    results, so the model is kept busy while files are loaded and saved.
+    Filings are yielded only once their results are on disk.
+    """
+    read_queue = queue.Queue(maxsize=2)
+    write_queue = queue.Queue()
+    # Filled by the writer with each exported filing's result, an export
+    # error, and finally None once it has stopped
+    done_queue = queue.Queue()
+    
+    def read_documents():
+        try:
+            for file_path, output_file in jobs:
+                read_queue.put((file_path, output_file, load_document(file_path)))
+            read_queue.put(None)
+        except Exception as e:
+            read_queue.put(e)
+    
+    def write_results():
+        try:
+            while (item := write_queue.get()) is not None:
+                file_name, labels, names, contexts, output_file = item
+                export_results(labels, names, contexts, output_file)
+                done_queue.put((file_name, get_entity_type_counts(labels), len(labels)))
+        except Exception as e:
+            done_queue.put(e)
+        done_queue.put(None)
+    
+    def exported(block: bool) -> Iterator[Tuple[str, Dict[str, int], int]]:
+        """Yield the filings the writer has finished, raising its error if any"""
+        while True:
+            try:
+                item = done_queue.get(block=block)
+            except queue.Empty:
+                return
+            if item is None:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    
+    threading.Thread(target=read_documents, daemon=True).start()
+    writer = threading.Thread(target=write_results)
+    writer.start()
+    
+    try:
+        while (item := read_queue.get()) is not None:
+            if isinstance(item, Exception):
+                raise item
+            file_path, output_file, text = item
+            labels, names, contexts = extract_entities(text)
+            write_queue.put((os.path.basename(file_path), labels, names, contexts, output_file))
+            yield from exported(block=False)
+        
+        # Wait for the writer to finish the remaining exports
+        write_queue.put(None)
+        yield from exported(block=True)
+    finally:
+        # Stops the writer if we are leaving early; an extra None is harmless
+        write_queue.put(None)
+        writer.join()
+
+def process_sec_filings(max_workers: Optional[int] = None):
     # Get root directory and construct path to sec_filings
     root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     sec_filings_dir = os.path.join(root_dir, 'sample_drive', 'inbox', 'sec_filings')
     metadata_dir = os.path.join(root_dir, 'sample_drive', 'metadata', 'sec_filings')
 
     # Initialize counters
-    total_files = 0
     processed_files = 0
     skipped_files = 0
     total_entities = Counter()
     
-    # First count total files
-    for company_dir in os.listdir(sec_filings_dir):
-        company_path = os.path.join(sec_filings_dir, company_dir)
-        if not os.path.isdir(company_path):
-            continue
-        for filing_type in os.listdir(company_path):
-            filing_type_path = os.path.join(company_path, filing_type)
-            if not os.path.isdir(filing_type_path):
-                continue
-            total_files += len([f for f in os.listdir(filing_type_path) if f.endswith('.txt')])
-    
-    print(f"Found {total_files} files to process")
-    
-    # Process each company directory
-    for company_dir in os.listdir(sec_filings_dir):
-        company_path = os.path.join(sec_filings_dir, company_dir)
-        if not os.path.isdir(company_path):
+    # Collect every filing in a single pass over the tree
+    jobs = []
+    total_files = 0
+    for company_entry in os.scandir(sec_filings_dir):
+        if not company_entry.is_dir():
             continue
-            
-        print(f"\nProcessing company: {company_dir}")
         
-        # Process each filing type directory
-        for filing_type in os.listdir(company_path):
-            filing_type_path = os.path.join(company_path, filing_type)
-            if not os.path.isdir(filing_type_path):
+        # Check each filing type directory
+        for filing_type_entry in os.scandir(company_entry.path):
+            if not filing_type_entry.is_dir():
                 continue
-                
-            print(f"Processing filing type: {filing_type}")
             
-            # Process each .txt file
-            for file_name in os.listdir(filing_type_path):
-                if not file_name.endswith('.txt'):
+            # Check each .txt file
+            for file_entry in os.scandir(filing_type_entry.path):
+                if not file_entry.name.endswith('.txt'):
                     continue
-                    
-                file_path = os.path.join(filing_type_path, file_name)
+                total_files += 1
                 
                 # Create output path
-                output_dir = os.path.join(metadata_dir, company_dir, filing_type)
-                output_file = os.path.join(output_dir, f"{os.path.splitext(file_name)[0]}_entities.md")
+                output_dir = os.path.join(metadata_dir, company_entry.name, filing_type_entry.name)
+                output_file = os.path.join(output_dir, f"{os.path.splitext(file_entry.name)[0]}_entities.md")
                 
                 # Check if we should process this file
                 if not should_process_file(output_file):
                     skipped_files += 1
                     processed_files += 1
-                    print(f"\nSkipping {file_name} - output already exists")
-                    print(f"Progress: {processed_files}/{total_files} files ({processed_files/total_files*100:.1f}%)")
+                    print(f"Skipping {company_entry.name}/{filing_type_entry.name}/{file_entry.name} - output already exists")
                     continue
                 
-                print(f"\nProcessing file {processed_files + 1}/{total_files}: {file_name}")
-                
-                # Load and process the document
-                text = load_document(file_path)
-                print(f"Document length: {len(text):,} characters")
-                
-                entities, contexts = extract_entities(text)
-                
-                # Update entity type counts
-                type_counts = get_entity_type_counts(entities)
-                for entity_type, count in type_counts.items():
-                    total_entities[entity_type] += count
-                
-                # Export results
-                export_results(entities, contexts, output_file)
-                
-                processed_files += 1
-                print(f"Found {len(entities):,} unique entities")
-                print(f"Progress: {processed_files}/{total_files} files ({processed_files/total_files*100:.1f}%)")
+                jobs.append((file_entry.path, output_file))
+    
+    print(f"Found {total_files} files to process")
+    print(f"Progress: {processed_files}/{total_files} files already processed, {len(jobs)} to go")
+    
+    # Filings are independent, so spread them over worker processes. Each worker
+    # loads its own copy of the model, so the default is capped by memory; on GPU,
+    # stay in-process to avoid VRAM thrash and overlap file I/O with inference.
+    if max_workers is None:
+        max_workers = default_max_workers()
+    
+    # The pool is shut down even if a worker's exception propagates
+    pool = nullcontext()
+    if max_workers > 1:
+        pool = ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(max(1, (os.cpu_count() or 2) // max_workers),)
+        )
+    with pool as executor:
+        if executor is not None:
+            results = executor.map(_process_filing, jobs, chunksize=1)
+        else:
+            results = _process_filings_pipelined(jobs)
+        
+        for file_name, type_counts, entity_count in results:
+            # Update entity type counts
+            for entity_type, count in type_counts.items():
+                total_entities[entity_type] += count
+            
+            processed_files += 1
+            print(f"\nProcessed {file_name}: found {entity_count:,} unique entities")
+            print(f"Progress: {processed_files}/{total_files} files ({processed_files/total_files*100:.1f}%)")
     
     # Print final statistics
     print("\nProcessing complete!")
@@ -1,10 +1,14 @@
 import os
 import sys
 import mlx_whisper
+import numpy as np
+from mlx_whisper.audio import SAMPLE_RATE, load_audio
 import re
-import urllib.request
-import json
-from typing import Dict, Optional
+import shutil
+import orjson
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
 from pathlib import Path
 import datetime
 import logging
@@ -17,36 +21,85 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
-def get_project_root() -> str:
-    """Get root directory path"""
-    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+# Add project root to Python path
+sys.path.append(PROJECT_ROOT)
+
+METADATA_FILE = os.path.join(PROJECT_ROOT, 'sample_drive', 'metadata', 'podcasts', 'podcasts_metadata.json')
+
+from utils.fs.atomic import atomic_write
+from utils.http.session import create_session
+
+# Shared keep-alive session so episodes from the same CDN reuse connections
+_SESSION = create_session(
+    pool_connections=16,
+    pool_maxsize=32,
+    headers={'User-Agent': 'Mozilla/5.0'}
+)
+
+WHISPER_MODEL = "mlx-community/whisper-large-v3-turbo"
+
+# Number of episodes downloaded ahead of the one being transcribed
+DOWNLOAD_WORKERS = 4
+
+# Silence pruning: frames quieter than VAD_THRESHOLD_DB below the loudest
+# frame are treated as non-speech, and only gaps of at least
+# VAD_MIN_SILENCE_SECONDS are removed so pauses between words are kept
+VAD_FRAME_SECONDS = 0.03
+VAD_THRESHOLD_DB = -35.0
+VAD_MIN_SILENCE_SECONDS = 1.0
+VAD_PAD_SECONDS = 0.2
+
+# Whisper decodes each clip in its own 30 s window, so nearby speech segments
+# are merged into clips spanning up to this many seconds
+CLIP_MAX_SECONDS = 30
 
 def load_podcast_metadata() -> Dict:
     """Load podcast metadata file"""
-    root_dir = get_project_root()
-    metadata_file = os.path.join(root_dir, 'sample_drive', 'metadata', 'podcasts', 'podcasts_metadata.json')
-    with open(metadata_file, 'r') as f:
-        return json.load(f)
+    with open(METADATA_FILE, 'rb') as f:
+        return orjson.loads(f.read())
 
 def save_podcast_metadata(metadata: Dict) -> None:
     """Save updated metadata"""
-    root_dir = get_project_root()
-    metadata_file = os.path.join(root_dir, 'sample_drive', 'metadata', 'podcasts', 'podcasts_metadata.json')
-    with open(metadata_file, 'w') as f:
-        json.dump(metadata, f, indent=2)
+    # Swapped in atomically, so a crash mid-write never leaves a truncated
+    # metadata file behind
+    atomic_write(METADATA_FILE, orjson.dumps(metadata, option=orjson.OPT_INDENT_2))
+
+_RE_SPECIAL_CHARS = re.compile(r'[^\w\s-]')
+_RE_SEPARATORS = re.compile(r'[-\s]+')
 
 def create_safe_filename(title: str) -> str:
     """Create a safe, lowercase, underscore-joined filename from a title"""
     # Convert to lowercase and replace spaces/special chars with underscores
     safe_name = title.lower()
-    safe_name = re.sub(r'[^\w\s-]', '', safe_name)  # Remove special characters
-    safe_name = re.sub(r'[-\s]+', '_', safe_name)   # Replace spaces and hyphens with underscore
+    safe_name = _RE_SPECIAL_CHARS.sub('', safe_name)  # Remove special characters
+    safe_name = _RE_SEPARATORS.sub('_', safe_name)    # Replace spaces and hyphens with underscore
     return safe_name.strip('_')  # Remove leading/trailing underscores
 
+def drop_page_cache(fd: int) -> None:
+    """Tell the kernel a file's cached pages won't be reused (no-op where unsupported)"""
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        except OSError:
+            pass
+
+def is_nonempty_file(path: str) -> bool:
+    """Check whether a file exists and has content"""
+    try:
+        return os.path.getsize(path) > 0
+    except OSError:
+        return False
+
+def get_transcript_path(episode: Dict) -> str:
+    """Path the transcript of an episode is written to"""
+    safe_filename = create_safe_filename(episode['episode_title'])
+    return os.path.join(PROJECT_ROOT, 'sample_drive', 'inbox', 'podcasts', 'transcripts',
+                        episode['podcast_name'], f"{safe_filename}.txt")
+
 def download_episode(episode: Dict, podcast_name: str, episode_id: str) -> Optional[str]:
     """Download episode MP3 to appropriate folder"""
-    root_dir = get_project_root()
-    audio_dir = os.path.join(root_dir, 'sample_drive', 'inbox', 'podcasts', 'audio', podcast_name)
+    audio_dir = os.path.join(PROJECT_ROOT, 'sample_drive', 'inbox', 'podcasts', 'audio', podcast_name)
     os.makedirs(audio_dir, exist_ok=True)
     
     try:
@@ -54,35 +107,136 @@ def download_episode(episode: Dict, podcast_name: str, episode_id: str) -> Optio
         safe_filename = create_safe_filename(episode['episode_title'])
         audio_file = os.path.join(audio_dir, f"{safe_filename}.mp3")
         
-        # Download the file
-        opener = urllib.request.build_opener()
-        opener.addheaders = [('User-Agent', 'Mozilla/5.0')]
-        urllib.request.install_opener(opener)
-        urllib.request.urlretrieve(episode['enclosure_url'], audio_file)
+        # Reuse a download left behind by an earlier run
+        if is_nonempty_file(audio_file):
+            print(f"Using existing download for {episode['episode_title']}")
+            return audio_file
+        
+        # Stream the file to disk in 1 MiB chunks, under a temporary name so
+        # an interrupted download is never mistaken for a complete one
+        partial_file = f"{audio_file}.part"
+        with _SESSION.get(episode['enclosure_url'], stream=True, timeout=(5, 60)) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            with open(partial_file, 'wb', buffering=1 << 20) as f:
+                shutil.copyfileobj(response.raw, f, length=1 << 20)
+        os.replace(partial_file, audio_file)
         
         return audio_file
     except Exception as e:
         print(f"Error downloading {episode['episode_title']}: {str(e)}")
         return None
 
+def detect_speech_segments(audio: np.ndarray, sample_rate: int = SAMPLE_RATE) -> List[Tuple[int, int]]:
+    """
+    Find the voiced regions of a mono waveform using frame energy.
+    
+    Args:
+        audio: Float32 waveform as returned by load_audio
+        sample_rate: Sample rate of the waveform
+        
+    Returns:
+        List of (start, end) sample offsets into the original audio
+    """
+    frame = int(sample_rate * VAD_FRAME_SECONDS)
+    n_frames = len(audio) // frame
+    if n_frames == 0:
+        return [(0, len(audio))]
+    
+    frames = audio[:n_frames * frame].reshape(n_frames, frame)
+    rms = np.sqrt(np.mean(np.square(frames), axis=1))
+    threshold = max(rms.max() * 10 ** (VAD_THRESHOLD_DB / 20), 1e-4)
+    voiced = np.concatenate(([0], (rms > threshold).astype(np.int8), [0]))
+    
+    # Rising/falling edges give the start/end frame of every voiced run
+    edges = np.flatnonzero(np.diff(voiced))
+    if len(edges) == 0:
+        return [(0, len(audio))]
+    
+    min_gap = int(VAD_MIN_SILENCE_SECONDS / VAD_FRAME_SECONDS)
+    runs = []
+    for start, end in zip(edges[::2], edges[1::2]):
+        if runs and start - runs[-1][1] < min_gap:
+            runs[-1][1] = end
+        else:
+            runs.append([start, end])
+    
+    pad = int(sample_rate * VAD_PAD_SECONDS)
+    return [
+        (max(0, start * frame - pad), min(len(audio), end * frame + pad))
+        for start, end in runs
+    ]
+
+def merge_speech_segments(segments: List[Tuple[int, int]], max_samples: int) -> List[Tuple[int, int]]:
+    """
+    Merge consecutive speech segments into clips spanning at most max_samples.
+    
+    Clips start and end on segment boundaries, so a segment longer than
+    max_samples becomes a clip of its own rather than being split mid-word.
+    
+    Args:
+        segments: (start, end) sample offsets from detect_speech_segments
+        max_samples: Longest clip span in samples
+        
+    Returns:
+        List of (start, end) clip offsets into the original audio
+    """
+    clips = []
+    for start, end in segments:
+        if clips and end - clips[-1][0] <= max_samples:
+            clips[-1][1] = end
+        else:
+            clips.append([start, end])
+    return [(start, end) for start, end in clips]
+
+def prune_silence(audio_file: str) -> Tuple[np.ndarray, List[float]]:
+    """
+    Load an audio file at Whisper's sample rate and find the speech to keep.
+    
+    Args:
+        audio_file: Path to the audio file
+        
+    Returns:
+        Tuple of (full waveform, flat list of clip start/end times in
+        seconds) for transcribe's clip_timestamps, so long silences are
+        skipped while timestamps stay on the source timeline
+    """
+    audio = load_audio(audio_file)
+    # The decoded waveform is all that is used from here on; the file's pages
+    # are clean now that it has been read back, so they can be dropped
+    with open(audio_file, 'rb') as f:
+        drop_page_cache(f.fileno())
+    segments = detect_speech_segments(audio)
+    clips = merge_speech_segments(segments, CLIP_MAX_SECONDS * SAMPLE_RATE)
+    clip_timestamps = [float(offset) / SAMPLE_RATE for clip in clips for offset in clip]
+    
+    kept = sum(end - start for start, end in clips) / max(len(audio), 1)
+    logger.info(f"Kept {kept:.0%} of audio after silence pruning ({len(segments)} segments, {len(clips)} clips)")
+    return audio, clip_timestamps
+
 def transcribe_audio(audio_file: str, podcast_name: str) -> Optional[str]:
     """Transcribe audio file using MLX Whisper"""
-    root_dir = get_project_root()
-    transcript_dir = os.path.join(root_dir, 'sample_drive', 'inbox', 'podcasts', 'transcripts', podcast_name)
+    transcript_dir = os.path.join(PROJECT_ROOT, 'sample_drive', 'inbox', 'podcasts', 'transcripts', podcast_name)
     os.makedirs(transcript_dir, exist_ok=True)
     
     try:
         # Start transcription
-        relative_audio_path = os.path.relpath(audio_file, root_dir)
+        relative_audio_path = os.path.relpath(audio_file, PROJECT_ROOT)
         logger.info(f"Starting transcription of {relative_audio_path}")
         start_time = datetime.datetime.now()
         
-        # Transcribe with mlx-whisper
+        # One sequential pass over the voiced parts of the episode, so
+        # Whisper keeps its context across segments and detects the
+        # language once; mlx_whisper keeps the loaded model between calls
+        audio, clip_timestamps = prune_silence(audio_file)
         result = mlx_whisper.transcribe(
-            audio_file, 
-            path_or_hf_repo="mlx-community/whisper-large-v3-turbo",
-            verbose=False  # Disable verbose output since we're using tqdm
+            audio,
+            path_or_hf_repo=WHISPER_MODEL,
+            clip_timestamps=clip_timestamps,
+            fp16=True,  # Half-precision weights and activations
+            verbose=None  # Silence both per-segment text and the progress bar
         )
+        text = result["text"].strip()
         
         # Calculate and log duration
         end_time = datetime.datetime.now()
@@ -95,10 +249,12 @@ def transcribe_audio(audio_file: str, podcast_name: str) -> Optional[str]:
         
         # Save transcript
         logger.info("Saving transcript...")
-        with open(transcript_file, 'w', encoding='utf-8') as f:
-            f.write(result["text"])
+        partial_file = f"{transcript_file}.part"
+        with open(partial_file, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(partial_file, transcript_file)
         
-        relative_transcript_path = os.path.relpath(transcript_file, root_dir)
+        relative_transcript_path = os.path.relpath(transcript_file, PROJECT_ROOT)
         logger.info(f"Transcript saved to {relative_transcript_path}")
         return transcript_file
         
@@ -113,17 +269,37 @@ def cleanup_audio(audio_file: str) -> None:
     except Exception as e:
         print(f"Error deleting {audio_file}: {str(e)}")
 
-def process_episode(episode_id: str, episode_data: Dict, metadata: Dict) -> bool:
+def mark_completed(episode_id: str, transcript_file: str, metadata: Dict) -> None:
+    """Record a finished transcript for an episode in metadata"""
+    # Update metadata with relative path using consistent filename format
+    relative_transcript_path = os.path.relpath(transcript_file, PROJECT_ROOT)
+    
+    metadata['processed_episodes'][episode_id].update({
+        'processed_date': datetime.datetime.now().isoformat(),
+        'transcription_file': relative_transcript_path,
+        'status': 'completed'
+    })
+
+def skip_if_transcribed(episode_id: str, episode_data: Dict, metadata: Dict) -> bool:
     """
-    Process a single episode from download through transcription.
+    Mark an episode completed without any work if its transcript already exists.
+    Returns True if the episode was skipped.
+    """
+    transcript_file = get_transcript_path(episode_data)
+    if not is_nonempty_file(transcript_file):
+        return False
+    
+    mark_completed(episode_id, transcript_file, metadata)
+    print(f"Transcript already exists for {episode_data['episode_title']}, skipping")
+    return True
+
+def finish_episode(episode_id: str, episode_data: Dict, audio_file: Optional[str], metadata: Dict) -> bool:
+    """
+    Transcribe a downloaded episode and record the result in metadata.
     Returns True if successful, False otherwise.
     """
-    root_dir = get_project_root()
-    print(f"\nProcessing: {episode_data['episode_title']}")
     
     try:
-        # Download audio
-        audio_file = download_episode(episode_data, episode_data['podcast_name'], episode_id)
         if not audio_file:
             metadata['processed_episodes'][episode_id]['status'] = 'failed'
             return False
@@ -135,14 +311,7 @@ def process_episode(episode_id: str, episode_data: Dict, metadata: Dict) -> bool
             cleanup_audio(audio_file)
             return False
         
-        # Update metadata with relative path using consistent filename format
-        relative_transcript_path = os.path.relpath(transcript_file, root_dir)
-        
-        metadata['processed_episodes'][episode_id].update({
-            'processed_date': datetime.datetime.now().isoformat(),
-            'transcription_file': relative_transcript_path,
-            'status': 'completed'
-        })
+        mark_completed(episode_id, transcript_file, metadata)
         
         # Cleanup
         cleanup_audio(audio_file)
@@ -154,6 +323,36 @@ def process_episode(episode_id: str, episode_data: Dict, metadata: Dict) -> bool
         metadata['processed_episodes'][episode_id]['status'] = 'failed'
         return False
 
+def process_episode(episode_id: str, episode_data: Dict, metadata: Dict) -> bool:
+    """
+    Process a single episode from download through transcription.
+    Returns True if successful, False otherwise.
+    """
+    print(f"\nProcessing: {episode_data['episode_title']}")
+    if skip_if_transcribed(episode_id, episode_data, metadata):
+        return True
+    audio_file = download_episode(episode_data, episode_data['podcast_name'], episode_id)
+    return finish_episode(episode_id, episode_data, audio_file, metadata)
+
+def prefetch_downloads(episodes: List[Tuple[str, Dict]],
+                       max_workers: int = DOWNLOAD_WORKERS) -> Iterator[Tuple[str, Dict, Optional[str]]]:
+    """
+    Yield (episode_id, episode_data, audio_file) in order, downloading up to
+    max_workers upcoming episodes in the background while the caller transcribes.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        in_flight = deque()
+        for episode_id, episode_data in episodes:
+            future = executor.submit(download_episode, episode_data, episode_data['podcast_name'], episode_id)
+            in_flight.append((episode_id, episode_data, future))
+            if len(in_flight) > max_workers:
+                episode_id, episode_data, future = in_flight.popleft()
+                yield episode_id, episode_data, future.result()
+        
+        while in_flight:
+            episode_id, episode_data, future = in_flight.popleft()
+            yield episode_id, episode_data, future.result()
+
 def process_pending_episodes(batch_size: int = 5, max_episodes: Optional[int] = None):
     """Process pending episodes in batches"""
     metadata = load_podcast_metadata()
@@ -166,20 +365,34 @@ def process_pending_episodes(batch_size: int = 5, max_episodes: Optional[int] =
     
     print(f"Found {len(pending_episodes)} pending episodes")
     
+    # Episodes transcribed by an interrupted run only need their status fixed
+    pending_episodes = [
+        (ep_id, ep_data) for ep_id, ep_data in pending_episodes
+        if not skip_if_transcribed(ep_id, ep_data, metadata)
+    ]
+    
     if max_episodes is not None:
         if len(pending_episodes) > max_episodes:
             pending_episodes = pending_episodes[:max_episodes]
             print(f"Limiting to {max_episodes} episodes")
     
-    # Process in batches
-    for i in range(0, len(pending_episodes), batch_size):
-        batch = pending_episodes[i:i + batch_size]
-        print(f"\nProcessing batch {i//batch_size + 1}")
-        
-        for episode_id, episode_data in batch:
-            success = process_episode(episode_id, episode_data, metadata)
-            # Save metadata after each episode regardless of success
-            save_podcast_metadata(metadata)
+    # Downloads run ahead in a thread pool while episodes are transcribed one at a
+    # time, since the MLX model shares a single GPU
+    downloads = prefetch_downloads(pending_episodes)
+    try:
+        for i, (episode_id, episode_data, audio_file) in enumerate(downloads):
+            if i % batch_size == 0:
+                print(f"\nProcessing batch {i//batch_size + 1}")
+            
+            print(f"\nProcessing: {episode_data['episode_title']}")
+            finish_episode(episode_id, episode_data, audio_file, metadata)
+            
+            # Checkpoint metadata once per batch rather than after every episode
+            if (i + 1) % batch_size == 0:
+                save_podcast_metadata(metadata)
+    finally:
+        # Keep progress from a partial batch, even if interrupted
+        save_podcast_metadata(metadata)
 
 def main():
     import argparse
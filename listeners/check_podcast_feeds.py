@@ -1,29 +1,43 @@
-import json
+import io
+import orjson
 import os
-import urllib.request
-import podcastparser
+import sys
 import datetime
+import requests
+from email.utils import mktime_tz, parsedate_tz
+from lxml import etree
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Set
 
-def get_project_root() -> str:
-    """Get root directory path"""
-    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+# Add project root to Python path
+sys.path.append(PROJECT_ROOT)
+
+METADATA_FILE = os.path.join(PROJECT_ROOT, 'sample_drive', 'metadata', 'podcasts', 'podcasts_metadata.json')
+
+from utils.fs.atomic import atomic_write
+from utils.http.session import create_session
+
+FEED_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
+    'Accept': 'application/rss+xml,application/xml,application/xhtml+xml,text/html;q=0.9,text/plain;q=0.8,*/*;q=0.7',
+}
+
+# Shared keep-alive session so feeds on the same host reuse connections
+_SESSION = create_session(pool_connections=16, pool_maxsize=32, headers=FEED_HEADERS)
 
 def load_tracked_podcasts() -> Dict:
     """Load the tracked podcasts configuration"""
-    root_dir = get_project_root()
-    config_path = os.path.join(root_dir, 'sample_drive', 'metadata', 'podcasts', 'tracked_podcasts.json')
-    with open(config_path, 'r') as f:
-        return json.load(f)
+    config_path = os.path.join(PROJECT_ROOT, 'sample_drive', 'metadata', 'podcasts', 'tracked_podcasts.json')
+    with open(config_path, 'rb') as f:
+        return orjson.loads(f.read())
 
 def load_podcast_metadata() -> Dict:
     """Load or create the podcast metadata file"""
-    root_dir = get_project_root()
-    metadata_file = os.path.join(root_dir, 'sample_drive', 'metadata', 'podcasts', 'podcasts_metadata.json')
     
-    if os.path.exists(metadata_file):
-        with open(metadata_file, 'r') as f:
-            return json.load(f)
+    if os.path.exists(METADATA_FILE):
+        with open(METADATA_FILE, 'rb') as f:
+            return orjson.loads(f.read())
     else:
         # Create initial metadata structure
         return {
@@ -33,23 +47,118 @@ def load_podcast_metadata() -> Dict:
 
 def save_podcast_metadata(metadata: Dict) -> None:
     """Save updated metadata"""
-    root_dir = get_project_root()
-    metadata_file = os.path.join(root_dir, 'sample_drive', 'metadata', 'podcasts', 'podcasts_metadata.json')
     
     # Ensure metadata directory exists
-    os.makedirs(os.path.dirname(metadata_file), exist_ok=True)
+    os.makedirs(os.path.dirname(METADATA_FILE), exist_ok=True)
     
-    with open(metadata_file, 'w') as f:
-        json.dump(metadata, f, indent=2)
+    # Swapped in atomically, so a crash mid-write never leaves a truncated
+    # metadata file behind
+    atomic_write(METADATA_FILE, orjson.dumps(metadata, option=orjson.OPT_INDENT_2))
+
+ITUNES_DURATION = '{http://www.itunes.com/dtds/podcast-1.0.dtd}duration'
+
+def parse_duration(value: str) -> int:
+    """Convert an itunes:duration value (SS, MM:SS or HH:MM:SS) to seconds"""
+    seconds = 0
+    try:
+        for part in value.strip().split(':'):
+            seconds = seconds * 60 + int(float(part))
+    except ValueError:
+        return 0
+    return seconds
 
-def create_opener():
-    """Create URL opener with proper headers"""
-    opener = urllib.request.build_opener()
-    opener.addheaders = [
-        ('User-Agent', 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36'),
-        ('Accept', 'application/rss+xml,application/xml,application/xhtml+xml,text/html;q=0.9,text/plain;q=0.8,*/*;q=0.7'),
-    ]
-    return opener
+def parse_pubdate(value: str) -> int:
+    """Convert an RFC 822 pubDate to a Unix timestamp, or 0 if unparseable"""
+    parsed = parsedate_tz(value) if value else None
+    if parsed is None:
+        return 0
+    try:
+        return int(mktime_tz(parsed))
+    except (OverflowError, ValueError):
+        return 0
+
+def parse_feed(content: bytes) -> List[Dict]:
+    """
+    Parse the items of an RSS feed into episode dicts.
+    
+    Each <item> is cleared as soon as it has been read, so memory stays flat
+    regardless of how many episodes the feed carries.
+    
+    Args:
+        content: Raw feed XML
+        
+    Returns:
+        List of dicts with guid, title, published, duration, enclosures
+        and description keys
+    """
+    episodes = []
+    items = etree.iterparse(io.BytesIO(content), tag='item', recover=True, resolve_entities=False)
+    for _, item in items:
+        enclosures = [
+            {'url': enclosure.get('url').strip()}
+            for enclosure in item.iterfind('enclosure')
+            if enclosure.get('url')
+        ]
+        
+        # Same fallbacks as podcastparser: guid, then link, then enclosure URL
+        guid = (item.findtext('guid') or item.findtext('link') or '').strip()
+        if not guid and enclosures:
+            guid = enclosures[0]['url']
+        
+        if guid:
+            episodes.append({
+                'guid': guid,
+                'title': ' '.join((item.findtext('title') or '').split()),
+                'published': parse_pubdate(item.findtext('pubDate')),
+                'duration': parse_duration(item.findtext(ITUNES_DURATION) or ''),
+                'enclosures': enclosures,
+                'description': (item.findtext('description') or '').strip(),
+            })
+        
+        # Free the item and any siblings already processed
+        item.clear()
+        while item.getprevious() is not None:
+            del item.getparent()[0]
+    
+    return episodes
+
+def poll_feed(podcast: Dict, processed_episodes: Set[str]) -> List[Dict]:
+    """Fetch and parse one podcast feed, returning episodes not yet processed"""
+    new_episodes = []
+    try:
+        response = _SESSION.get(podcast['rss_url'], timeout=(5, 30))
+        response.raise_for_status()
+        
+        # Process each episode in the feed
+        for episode in parse_feed(response.content):
+            # Create unique identifier for episode
+            episode_id = f"{podcast['name']}_{episode['guid']}"
+            
+            if episode_id not in processed_episodes:
+                new_episode = {
+                    'podcast_name': podcast['name'],
+                    'episode_title': episode['title'],
+                    'episode_id': episode_id,
+                    'published': episode['published'],
+                    'duration': episode.get('duration', 0),
+                    'enclosure_url': episode.get('enclosures', [{}])[0].get('url', ''),
+                    'description': episode.get('description', '')
+                }
+                new_episodes.append(new_episode)
+        
+        if new_episodes:
+            print(f"{podcast['name']}: found {len(new_episodes)} new episodes")
+        else:
+            print(f"{podcast['name']}: no new episodes found")
+            
+    except requests.HTTPError as e:
+        print(f"HTTP Error for {podcast['name']}: {e.response.status_code} - {e.response.reason}")
+    except requests.RequestException as e:
+        print(f"URL Error for {podcast['name']}: {str(e)}")
+    except Exception as e:
+        print(f"Error processing feed {podcast['name']}: {str(e)}")
+    
+    return new_episodes
 
 def main():
     # Load configurations
@@ -59,56 +168,19 @@ def main():
     # Get set of processed episodes
     processed_episodes = set(metadata['processed_episodes'].keys())
     
-    # Track new episodes
-    new_episodes = []
-    
     # Update last check time
     metadata['last_check'] = datetime.datetime.now().isoformat()
     
-    # Create URL opener with headers
-    opener = create_opener()
-
-    # Check each podcast feed
-    for podcast in tracked_podcasts['podcasts']:
-        if not podcast['transcribe']:
-            continue
-            
-        print(f"\nChecking feed for: {podcast['name']}")
-        try:
-            response = opener.open(podcast['rss_url'])
-            parsed = podcastparser.parse(podcast['rss_url'], response)
-            
-            # Process each episode in the feed
-            for episode in parsed['episodes']:
-                # Create unique identifier for episode
-                episode_id = f"{podcast['name']}_{episode['guid']}"
-                
-                if episode_id not in processed_episodes:
-                    new_episode = {
-                        'podcast_name': podcast['name'],
-                        'episode_title': episode['title'],
-                        'episode_id': episode_id,
-                        'published': episode['published'],
-                        'duration': episode.get('duration', 0),
-                        'enclosure_url': episode.get('enclosures', [{}])[0].get('url', ''),
-                        'description': episode.get('description', '')
-                    }
-                    new_episodes.append(new_episode)
-            
-            if new_episodes:
-                print(f"Found {len(new_episodes)} new episodes")
-            else:
-                print("No new episodes found")
-                
-        except urllib.error.HTTPError as e:
-            print(f"HTTP Error for {podcast['name']}: {e.code} - {e.reason}")
-            continue
-        except urllib.error.URLError as e:
-            print(f"URL Error for {podcast['name']}: {str(e)}")
-            continue
-        except Exception as e:
-            print(f"Error processing feed {podcast['name']}: {str(e)}")
-            continue
+    # Feed polling is pure network I/O, so check all feeds concurrently
+    podcasts = [podcast for podcast in tracked_podcasts['podcasts'] if podcast['transcribe']]
+    print(f"Checking {len(podcasts)} podcast feeds...")
+    
+    new_episodes = []
+    if podcasts:
+        with ThreadPoolExecutor(max_workers=min(16, len(podcasts))) as executor:
+            results = executor.map(lambda podcast: poll_feed(podcast, processed_episodes), podcasts)
+            for episodes in results:
+                new_episodes.extend(episodes)
     
     # Update metadata with new episodes
     for episode in new_episodes:
@@ -1,9 +1,9 @@
 # sec_filing_scraper.py
 import os
-import json
+import orjson
 import logging
-import re
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Get absolute path to project root (parent of scrapers directory)
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
@@ -12,7 +12,7 @@ sys.path.append(PROJECT_ROOT)
 
 from edgar import set_identity, Company
 from utils.sec_filings.company_mappings import CompanyMappings
-from utils.sec_filings.filing_utils import save_filing, EXHIBIT_PATTERNS
+from utils.sec_filings.filing_utils import save_filing, COMPILED_EXHIBIT_PATTERNS
 
 # ─── Configuration ────────────────────────────────────────────────────────────
 
@@ -21,6 +21,8 @@ STORAGE_DIR = os.path.join(PROJECT_ROOT, "sample_drive/inbox/sec_filings")
 METADATA_FILE = os.path.join(PROJECT_ROOT, "sample_drive/metadata/sec_filings/tracked_companies.json")
 USER_AGENT = "CortexBot/1.0 (your_email@example.com)"
 VALID_FORMS = ["10-K", "8-K", "10-Q", "S-1", "20-F", "6-K"]
+# SEC allows ~10 requests/second; a few serial workers stay under that cap
+MAX_WORKERS = 4
 
 logging.basicConfig(level=logging.INFO)
 
@@ -30,17 +32,65 @@ set_identity(USER_AGENT)
 def get_tracked_companies():
     """Load list of companies to track from metadata"""
     try:
-        with open(METADATA_FILE, 'r') as f:
-            data = json.load(f)
+        with open(METADATA_FILE, 'rb') as f:
+            data = orjson.loads(f.read())
             return data.get('companies', [])
     except FileNotFoundError:
         logging.error(f"Tracked companies file not found: {METADATA_FILE}")
         return []
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         logging.error(f"Invalid JSON in tracked companies file: {METADATA_FILE}")
         return []
 
-def fetch_latest_filings(identifiers: str | list = None, forms: list = None, count: int | str = 1):
+def _process_company_form(company, display_id: str, form: str, count: int | str = 1):
+    """Fetch and save the most recent filings of one form type for one company"""
+    filings = company.get_filings(form=form)
+    if not filings:
+        logging.info(f"No {form} filings found for {display_id}")
+        return
+    
+    # Get exhibit patterns for this form type
+    form_patterns = COMPILED_EXHIBIT_PATTERNS.get(form, [])
+    
+    # Process the specified number of filings
+    num_filings = len(filings) if count == 'all' else min(count, len(filings))
+    
+    for i in range(num_filings):
+        filing = filings[i]
+        
+        # Handle attachments
+        attachments = []
+        if form_patterns:
+            try:
+                all_attachments = filing.attachments
+                
+                # Check each attachment against patterns for this form
+                for att in all_attachments:
+                    att_str = str(att)
+                    for exhibit_name, regex in form_patterns:
+                        if regex.search(att_str):
+                            try:
+                                attachments.append((exhibit_name, att.text()))
+                                logging.info(f"Found {exhibit_name}")
+                            except Exception as e:
+                                logging.warning(f"Could not get text from {exhibit_name}: {e}")
+                                
+            except Exception as e:
+                logging.warning(f"Error getting attachments: {e}")
+        
+        save_filing(
+            html_content=filing.html(),
+            text_content=filing.text(),
+            base_dir=STORAGE_DIR,
+            company_id=display_id,
+            form=form,
+            accession_number=filing.accession_number,
+            filing_date=filing.filing_date,
+            attachments=attachments if attachments else None
+        )
+
+def fetch_latest_filings(identifiers: str | list = None, forms: list = None, count: int | str = 1,
+                         max_workers: int = MAX_WORKERS):
     """
     Fetch the single most recent filing for each form type for given identifiers.
     
@@ -48,6 +98,7 @@ def fetch_latest_filings(identifiers: str | list = None, forms: list = None, cou
         identifiers: Single identifier (str) or list of identifiers (tickers/CIKs).
                     If None, loads from tracked_companies.json
         forms: List of form types to fetch. If None, uses VALID_FORMS
+        max_workers: Number of (company, form) pairs fetched concurrently
     """
     # Handle input flexibility
     if identifiers is None:
@@ -61,63 +112,27 @@ def fetch_latest_filings(identifiers: str | list = None, forms: list = None, cou
     # Initialize company mappings
     mappings = CompanyMappings(USER_AGENT)
     
-    # Normalize and deduplicate identifiers
+    # Deduplicate raw identifiers before normalizing, then dedupe the CIKs
     normalized_ciks = set(
         mappings.normalize_identifier(id) 
-        for id in identifiers
+        for id in set(identifiers)
     )
     
-    for cik in normalized_ciks:
-        company = Company(cik)
-        display_id = mappings.get_display_id(cik)
+    # Each (company, form) pair is independent network work, so overlap them
+    # with a small pool that stays well under SEC's request rate limit
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
+        for cik in normalized_ciks:
+            company = Company(cik)
+            display_id = mappings.get_display_id(cik)
+            for form in forms:
+                future = executor.submit(_process_company_form, company, display_id, form, count)
+                futures[future] = (display_id, form)
         
-        for form in forms:
+        for future in as_completed(futures):
+            display_id, form = futures[future]
             try:
-                filings = company.get_filings(form=form)
-                if not filings:
-                    logging.info(f"No {form} filings found for {display_id}")
-                    continue
-                
-                # Get exhibit patterns for this form type
-                form_patterns = EXHIBIT_PATTERNS.get(form, [])
-                
-                # Process the specified number of filings
-                num_filings = len(filings) if count == 'all' else min(count, len(filings))
-                
-                for i in range(num_filings):
-                    filing = filings[i]
-                    
-                    # Handle attachments
-                    attachments = []
-                    if form_patterns:
-                        try:
-                            all_attachments = filing.attachments
-                            
-                            # Check each attachment against patterns for this form
-                            for att in all_attachments:
-                                att_str = str(att)
-                                for pattern in form_patterns:
-                                    if re.search(pattern['pattern'], att_str):
-                                        try:
-                                            attachments.append((pattern['name'], att.text()))
-                                            logging.info(f"Found {pattern['name']}")
-                                        except Exception as e:
-                                            logging.warning(f"Could not get text from {pattern['name']}: {e}")
-                                            
-                        except Exception as e:
-                            logging.warning(f"Error getting attachments: {e}")
-                    
-                    save_filing(
-                        html_content=filing.html(),
-                        text_content=filing.text(),
-                        base_dir=STORAGE_DIR,
-                        company_id=display_id,
-                        form=form,
-                        accession_number=filing.accession_number,
-                        filing_date=filing.filing_date,
-                        attachments=attachments if attachments else None
-                    )
-
+                future.result()
             except Exception as e:
                 logging.error(f"Error fetching {form} for {display_id}: {e}")
 
@@ -37,8 +37,9 @@ def parse_args() -> argparse.Namespace:
         help="Include -p to use the Premium Substack Scraper with selenium.",
     )
     parser.add_argument(
-        "--headless", action="store_true",
-        help="Run browser in headless mode for Premium Substack Scraper.",
+        "--headless", action=argparse.BooleanOptionalAction, default=True,
+        help="Run browser in headless mode for Premium Substack Scraper (default). "
+             "Use --no-headless to show the browser, e.g. to complete a CAPTCHA.",
     )
     parser.add_argument(
         "--chromium-binary",
@@ -96,6 +97,7 @@ def main():
                         base_substack_url=url,
                         md_save_dir=args.directory,
                         html_save_dir=args.html_directory,
+                        headless=args.headless,
                         chromium_binary=args.chromium_binary,
                         chromium_driver_path=args.chromium_driver_path
                     )
@@ -105,7 +107,8 @@ def main():
                         md_save_dir=args.directory,
                         html_save_dir=args.html_directory
                     )
-                scraper.scrape_posts(num_posts_to_scrape=args.number)
+                with scraper:
+                    scraper.scrape_posts(num_posts_to_scrape=args.number)
                 
                 # Add delay between different Substacks
                 if i < len(substacks) - 1:  # If not the last Substack
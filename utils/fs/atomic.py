@@ -0,0 +1,42 @@
+# utils/fs/atomic.py
+import os
+import stat
+import tempfile
+
+def atomic_write(path: str, data: bytes, mode: int = 0o644) -> None:
+    """
+    Replace the file at path with data so readers never see a partial write.
+    
+    The data goes to a temp file in the same directory, is fsynced, and is
+    then renamed over path. An existing file keeps its permissions; a new
+    one is created with mode. The temp file is removed if anything fails.
+    
+    Args:
+        path: Destination file
+        data: Complete new contents
+        mode: Permissions for a newly created file
+    """
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        pass
+    
+    directory, name = os.path.split(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory or '.', prefix=f'.{name}.', suffix='.tmp')
+    try:
+        try:
+            # mkstemp creates the file 0600; match the file being replaced
+            os.fchmod(fd, mode)
+            buf = memoryview(data)
+            while buf:
+                buf = buf[os.write(fd, buf):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
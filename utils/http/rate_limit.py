@@ -0,0 +1,50 @@
+# utils/http/rate_limit.py
+import threading
+import time
+
+class TokenBucket:
+    """
+    Thread-safe token bucket limiting callers to `rate` acquisitions per
+    second on average, with bursts of up to `capacity`.
+    """
+
+    def __init__(self, rate: float, capacity: int = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a token is available, then take it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            # Sleep outside the lock so other threads can refill/check
+            time.sleep(wait)
+
+class HostLimiter:
+    """
+    Caps the number of requests in flight to any one host at `per_host`,
+    while requests to different hosts proceed independently.
+    """
+
+    def __init__(self, per_host: int):
+        self.per_host = per_host
+        self._semaphores = {}
+        self._lock = threading.Lock()
+
+    def for_url(self, url: str) -> threading.BoundedSemaphore:
+        """Return the semaphore guarding the URL's host"""
+        host = url.partition('://')[2].partition('/')[0]
+        sem = self._semaphores.get(host)
+        if sem is None:
+            with self._lock:
+                sem = self._semaphores.setdefault(host, threading.BoundedSemaphore(self.per_host))
+        return sem
@@ -0,0 +1,41 @@
+# utils/http/session.py
+from typing import Collection, Dict, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+def create_session(pool_connections: int = 10,
+                   pool_maxsize: int = 10,
+                   retries: int = 3,
+                   backoff_factor: float = 0.5,
+                   status_forcelist: Optional[Collection[int]] = None,
+                   headers: Optional[Dict[str, str]] = None) -> requests.Session:
+    """
+    Create a requests Session with keep-alive connection pooling and retries.
+    
+    Args:
+        pool_connections: Number of hosts to keep connection pools for
+        pool_maxsize: Maximum number of pooled connections per host
+        retries: Number of retries for failed requests
+        backoff_factor: Exponential backoff factor between retries (seconds)
+        status_forcelist: HTTP status codes that are also retried, such as 429
+        headers: Default headers to send with every request
+        
+    Returns:
+        Configured requests Session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=status_forcelist
+        )
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
@@ -20,27 +20,27 @@ def format_entity_table(df: pd.DataFrame,
     # Use specified columns or all columns
     columns = columns or df.columns.tolist()
     
-    # Create header
-    header = " | ".join(columns)
-    markdown = f"| {header} |\n"
-    
-    # Create separator
-    separator = "|" + "|".join(["---" for _ in columns]) + "|\n"
-    markdown += separator
+    # Handle special formatting for Documents column
+    table = df[columns]
+    if 'Documents' in columns:
+        table = table.copy()
+        table['Documents'] = table['Documents'].map(
+            lambda value: ", ".join(value) if isinstance(value, list) else value
+        )
+    
+    # Create header and separator
+    lines = [
+        f"| {' | '.join(columns)} |\n",
+        "|" + "|".join(["---" for _ in columns]) + "|\n"
+    ]
     
     # Add rows
-    for _, row in df.iterrows():
-        # Handle special formatting for Documents column
-        row_data = []
-        for col in columns:
-            value = row[col]
-            if col == 'Documents' and isinstance(value, list):
-                value = ", ".join(value)
-            row_data.append(str(value))
-            
-        markdown += f"| {' | '.join(row_data)} |\n"
-    
-    return markdown
+    lines.extend(
+        f"| {' | '.join(map(str, row))} |\n"
+        for row in table.itertuples(index=False, name=None)
+    )
+    
+    return ''.join(lines)
 
 def save_markdown_table(df: pd.DataFrame, 
                        output_file: str,
@@ -1,6 +1,8 @@
 # utils/markdown/parser.py
+import csv
 import pandas as pd
 import logging
+from io import StringIO
 from typing import Optional
 
 def parse_entity_table(file_path: str) -> Optional[pd.DataFrame]:
@@ -16,30 +18,50 @@ def parse_entity_table(file_path: str) -> Optional[pd.DataFrame]:
     """
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+            # Stream lines until the table header
+            for line in f:
+                if '| Entity Type |' in line:
+                    break
+            else:
+                logging.warning(f"No entity table found in {file_path}")
+                return None
+            
+            # Parse header
+            header = [col.strip() for col in line.split('|')[1:-1]]
+            
+            # Skip the separator, then read body lines up to the end of the table.
+            # Only rows with exactly one cell per column are kept, so short
+            # rows and rows with an extra '|' in a cell are dropped; the C
+            # parser would otherwise pad short rows with empty cells.
+            next(f, None)
+            pipes_per_row = len(header) + 1
+            body = []
+            for line in f:
+                if not line.startswith('|'):
+                    break
+                if line.count('|') == pipes_per_row:
+                    body.append(line)
         
-        # Split into lines and find table start
-        lines = content.split('\n')
-        try:
-            table_start = next(i for i, line in enumerate(lines) if '| Entity Type |' in line)
-        except StopIteration:
-            logging.warning(f"No entity table found in {file_path}")
-            return None
+        if not body:
+            return pd.DataFrame(columns=header)
         
-        # Parse header
-        header = [col.strip() for col in lines[table_start].split('|')[1:-1]]
+        # Let the C parser split the '|'-delimited body. Each row has an empty
+        # leading field and a trailing one holding whatever follows the last '|'.
+        df = pd.read_csv(
+            StringIO(''.join(body)),
+            sep='|',
+            header=None,
+            names=['_lead'] + header + ['_trail'],
+            dtype=str,
+            na_filter=False,
+            quoting=csv.QUOTE_NONE,
+            engine='c'
+        ).iloc[:, 1:-1]
         
-        # Parse data rows
-        rows = []
-        for line in lines[table_start+2:]:  # Skip header and separator
-            if line.startswith('|'):
-                cells = [cell.strip() for cell in line.split('|')[1:-1]]
-                if len(cells) == len(header):
-                    rows.append(cells)
-            else:
-                break  # End of table
-                
-        return pd.DataFrame(rows, columns=header)
+        for col in header:
+            df[col] = df[col].str.strip()
+        
+        return df.reset_index(drop=True)
         
     except Exception as e:
         logging.error(f"Error parsing {file_path}: {e}")
@@ -1,8 +1,8 @@
 # utils/sec_filings/company_mappings.py
 import os
-import json
+import orjson
+import pickle
 import sys
-import requests
 import logging
 from datetime import datetime, timedelta
 
@@ -11,16 +11,24 @@ PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 # Add project root to Python path
 sys.path.append(PROJECT_ROOT)
 
+from utils.http.session import create_session
+
 class CompanyMappings:
     SEC_TICKERS_URL = "https://www.sec.gov/files/company_tickers.json"
     # Define paths relative to project root
     CACHE_FILE = os.path.join(PROJECT_ROOT, "sample_drive/utils/sec_filings/data/company_tickers.json")
+    # Built lookup dicts, rebuilt whenever CACHE_FILE is newer
+    MAPPINGS_CACHE_FILE = CACHE_FILE + ".pkl"
     CACHE_MAX_AGE_DAYS = 7
+    # Keep-alive session shared by every instance for calls to sec.gov
+    session = create_session(pool_connections=4, pool_maxsize=16)
 
     def __init__(self, user_agent):
         self.user_agent = user_agent
         self.ticker_to_cik = {}
         self.cik_to_ticker = {}
+        # Memoized normalize_identifier results (raw identifier -> CIK)
+        self._normalized_cache = {}
         self._load_mappings()
 
     def _load_mappings(self):
@@ -35,26 +43,44 @@ class CompanyMappings:
         if should_refresh:
             self._refresh_cache()
         
+        # Reuse the already-built dicts if they are at least as new as the JSON
+        if (os.path.exists(self.MAPPINGS_CACHE_FILE) and
+                os.path.getmtime(self.MAPPINGS_CACHE_FILE) >= os.path.getmtime(self.CACHE_FILE)):
+            try:
+                with open(self.MAPPINGS_CACHE_FILE, 'rb') as f:
+                    self.ticker_to_cik, self.cik_to_ticker = pickle.load(f)
+                return
+            except Exception as e:
+                logging.warning(f"Ignoring unreadable mappings cache: {e}")
+        
         # Load from cache
-        with open(self.CACHE_FILE, 'r') as f:
-            data = json.load(f)
+        with open(self.CACHE_FILE, 'rb') as f:
+            data = orjson.loads(f.read())
             
         for entry in data.values():
             cik_str = str(entry['cik_str']).zfill(10)
             ticker = entry['ticker']
-            self.ticker_to_cik[ticker] = cik_str
+            # Keyed upper-case so lookups are case-insensitive
+            self.ticker_to_cik[ticker.upper()] = cik_str
             self.cik_to_ticker[cik_str] = ticker
+        
+        try:
+            with open(self.MAPPINGS_CACHE_FILE, 'wb') as f:
+                pickle.dump((self.ticker_to_cik, self.cik_to_ticker), f, protocol=5)
+        except OSError as e:
+            logging.warning(f"Could not write mappings cache: {e}")
 
     def _refresh_cache(self):
         """Download fresh data from SEC"""
         try:
             os.makedirs(os.path.dirname(self.CACHE_FILE), exist_ok=True)
             headers = {'User-Agent': self.user_agent}
-            response = requests.get(self.SEC_TICKERS_URL, headers=headers)
+            response = self.session.get(self.SEC_TICKERS_URL, headers=headers, timeout=30)
             response.raise_for_status()
             
-            with open(self.CACHE_FILE, 'w') as f:
-                json.dump(response.json(), f, indent=2)
+            data = orjson.loads(response.content)
+            with open(self.CACHE_FILE, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
                 
         except Exception as e:
             logging.error(f"Error refreshing SEC mappings: {e}")
@@ -64,13 +90,17 @@ class CompanyMappings:
 
     def normalize_identifier(self, identifier: str) -> str:
         """Convert any identifier (ticker or CIK) to normalized CIK"""
+        cik = self._normalized_cache.get(identifier)
+        if cik is None:
+            cik = self._normalize_identifier(identifier)
+            self._normalized_cache[identifier] = cik
+        return cik
+
+    def _normalize_identifier(self, identifier: str) -> str:
+        identifier = identifier.strip()
         if identifier.isdigit():
-            identifier = identifier.zfill(10)
-            if identifier in self.cik_to_ticker:
-                return identifier
-        elif identifier in self.ticker_to_cik:
-            return self.ticker_to_cik[identifier]
-        return identifier
+            return identifier.zfill(10)
+        return self.ticker_to_cik.get(identifier.upper(), identifier)
 
     def get_display_id(self, cik: str) -> str:
         """Get display identifier (prefer ticker over CIK)"""
@@ -1,25 +1,41 @@
 # utils/sec_filings/filing_utils.py
 import os
+import re
 import logging
 
-# Exhibit patterns for different filing types
+# Exhibit patterns for different filing types, compiled once at import.
+# The trailing (?!\d) keeps EX-99.1 from also matching EX-99.10 and up.
 EXHIBIT_PATTERNS = {
     "8-K": [
-        {"pattern": r"EX-99\.1", "name": "ex991_earnings"},
-        {"pattern": r"EX-99\.2", "name": "ex992_slides"}
+        {"regex": re.compile(r"EX-99\.1(?!\d)", re.IGNORECASE), "name": "ex991_earnings"},
+        {"regex": re.compile(r"EX-99\.2(?!\d)", re.IGNORECASE), "name": "ex992_slides"}
     ],
     "6-K": [
-        {"pattern": r"EX-99\.1", "name": "ex991_earnings"},
-        {"pattern": r"EX-99\.2", "name": "ex992_slides"}
+        {"regex": re.compile(r"EX-99\.1(?!\d)", re.IGNORECASE), "name": "ex991_earnings"},
+        {"regex": re.compile(r"EX-99\.2(?!\d)", re.IGNORECASE), "name": "ex992_slides"}
     ],
     "20-F": [
-        {"pattern": r"EX-8\.1", "name": "ex81_subsidiaries"}
+        {"regex": re.compile(r"EX-8\.1(?!\d)", re.IGNORECASE), "name": "ex81_subsidiaries"}
     ],
     "10-K": [
-        {"pattern": r"EX-22\.1", "name": "ex221_subsidiaries"}
+        {"regex": re.compile(r"EX-22\.1(?!\d)", re.IGNORECASE), "name": "ex221_subsidiaries"}
     ]
 }
 
+# Same patterns as (exhibit name, regex) pairs per form
+COMPILED_EXHIBIT_PATTERNS = {
+    form: [(pattern["name"], pattern["regex"]) for pattern in patterns]
+    for form, patterns in EXHIBIT_PATTERNS.items()
+}
+
+# Output directories already created by this process
+_ensured_dirs = set()
+
+def _write_text(path, content):
+    """Write text as UTF-8 bytes in a single write call"""
+    with open(path, 'wb', buffering=1 << 20) as f:
+        f.write(content.encode('utf-8'))
+
 def save_filing(html_content, text_content, base_dir, company_id, form, accession_number, filing_date, attachments=None):
     """
     Save filing HTML and text content to appropriate location, along with any attachments
@@ -41,10 +57,14 @@ def save_filing(html_content, text_content, base_dir, company_id, form, accessio
     base_filename = f"{company_id.lower()}-{date_str}-{form.lower()}"
     
     out_dir = os.path.join(base_dir, company_id.upper(), form)
-    os.makedirs(out_dir, exist_ok=True)
+    if out_dir not in _ensured_dirs:
+        os.makedirs(out_dir, exist_ok=True)
+        _ensured_dirs.add(out_dir)
     
-    html_path = os.path.join(out_dir, f"{base_filename}.html")
-    text_path = os.path.join(out_dir, f"{base_filename}.txt")
+    # Every output file shares this directory + base name prefix
+    path_prefix = os.path.join(out_dir, base_filename)
+    html_path = f"{path_prefix}.html"
+    text_path = f"{path_prefix}.txt"
     
     # Check if files already exist
     if os.path.exists(html_path) and os.path.exists(text_path):
@@ -52,19 +72,15 @@ def save_filing(html_content, text_content, base_dir, company_id, form, accessio
         return False
     
     # Save main filing
-    with open(html_path, 'w', encoding='utf-8') as f:
-        f.write(html_content)
-    
-    with open(text_path, 'w', encoding='utf-8') as f:
-        f.write(text_content)
+    _write_text(html_path, html_content)
+    _write_text(text_path, text_content)
     
     # Save attachments if any
     if attachments:
         for exhibit_name, content in attachments:
             # Use same naming convention but append exhibit name
-            attachment_path = os.path.join(out_dir, f"{base_filename}-{exhibit_name}.txt")
-            with open(attachment_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            attachment_path = f"{path_prefix}-{exhibit_name}.txt"
+            _write_text(attachment_path, content)
             logging.info(f"Saved {exhibit_name}")
     
     logging.info(f"Saved {form} ({accession_number}) as HTML and text: {base_filename}")
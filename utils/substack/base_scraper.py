@@ -1,36 +1,123 @@
 from abc import ABC, abstractmethod
-from typing import List, Tuple
+from functools import cached_property
+from typing import Dict, List, Optional, Pattern, Tuple
+import io
 import os
-import json
+import re
+import orjson
 import logging
 from time import sleep
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import random
-import requests
-from bs4 import BeautifulSoup
+import multiprocessing
+import threading
 import html2text
-import markdown
+from selectolax.lexbor import LexborHTMLParser
+from markdown_it import MarkdownIt
 from tqdm import tqdm
-from xml.etree import ElementTree as ET
+from lxml import etree
 import random
 
-from .config import ESSAYS_METADATA_FILE
+from .config import ESSAYS_METADATA_FILE, ESSAYS_METADATA_JOURNAL, ESSAYS_URL_INDEX
 from .utils import extract_main_part
+from utils.fs.atomic import atomic_write
+from utils.http.session import create_session
+from utils.http.rate_limit import HostLimiter, TokenBucket
+
+# In-flight article requests allowed per host, shared by every scraper in the
+# process so parallel scrapers of one Substack don't add up
+_HOST_LIMITER = HostLimiter(per_host=5)
+
+SITEMAP_LOC_TAG = '{http://www.sitemaps.org/schemas/sitemap/0.9}loc'
+
+# Page wrapper for saved HTML posts; __CSS_PATH__ is filled in per file
+_HTML_HEADER = b"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>Markdown Content</title>
+<link rel="stylesheet" href="__CSS_PATH__">
+</head>
+<body>
+<main class="markdown-content">
+"""
+_HTML_FOOTER = b"""
+</main>
+</body>
+</html>
+"""
+
+# CommonMark renderer with the table and strikethrough syntax html2text emits,
+# configured once for every post
+_MARKDOWN = MarkdownIt("commonmark").enable("table").enable("strikethrough")
+
+# One configured HTML2Text per thread, reused across posts
+_H2T_LOCAL = threading.local()
+
+def _get_html2text() -> html2text.HTML2Text:
+    h = getattr(_H2T_LOCAL, 'converter', None)
+    if h is None:
+        h = html2text.HTML2Text()
+        h.ignore_links = False
+        h.body_width = 0
+        _H2T_LOCAL.converter = h
+    return h
+
+# Processes converting fetched posts to markdown, in parallel with fetching.
+# They are spawned rather than forked, since forking while the fetch threads
+# hold session, SSL or logging locks can deadlock the child.
+CONVERT_WORKERS = min(4, os.cpu_count() or 1)
+_CONVERT_CONTEXT = multiprocessing.get_context("spawn")
+
+def convert_post(title: str, subtitle: str, date: str, like_count: str, content_html: str) -> str:
+    """
+    Converts a post's content HTML to markdown headed by its metadata. Module
+    level so a process pool can pickle it.
+    """
+    md = BaseSubstackScraper.html_to_md(content_html)
+    return BaseSubstackScraper.combine_metadata_and_content(title, subtitle, date, like_count, md)
+
+# Pause the serial scraper took after each post; article requests default to
+# the same rate, however many workers share it
+REQUEST_INTERVAL = 0.5  # seconds
 
 class BaseSubstackScraper(ABC):
+    # Headers set on the session before its first request, sitemap and feed
+    # included; subclasses override this
+    SESSION_HEADERS: Optional[Dict[str, str]] = None
+
     def __init__(
             self, 
             base_substack_url: str, 
             md_save_dir: str, 
             html_save_dir: str,
+            requests_per_second: float = 1 / REQUEST_INTERVAL,
             **kwargs
     ):
         # Set retry and batch processing parameters first
         self.max_retries = 3
-        self.retry_delay = 60  # seconds
-        self.request_delay = 2  # seconds between requests
         self.batch_size = 25
         self.min_batch_delay = 7
         self.max_batch_delay = 10
+        # Concurrent article fetches per batch; subclasses that drive a
+        # single browser lower this to 1
+        self.fetch_workers = 8
+        # Article requests across all workers, averaged per second, with
+        # short bursts allowed
+        self.rate_limiter = TokenBucket(rate=requests_per_second, capacity=max(1, int(requests_per_second)))
+
+        # Keep-alive session for every request to this Substack; the adapter
+        # retries connection errors and 429/5xx responses with backoff. There
+        # is one host, with a pooled connection for each fetch worker.
+        self.session = create_session(
+            pool_connections=1,
+            pool_maxsize=self.fetch_workers,
+            retries=self.max_retries,
+            backoff_factor=2,
+            status_forcelist=(429, 500, 502, 503, 504),
+            headers=self.SESSION_HEADERS
+        )
 
         # Ensure consistent URL format
         if not base_substack_url.endswith("/"):
@@ -55,30 +142,101 @@ class BaseSubstackScraper(ABC):
         
         # Set other instance variables
         self.keywords = ["about", "archive", "podcast"]
+        self._keyword_re = re.compile("|".join(map(re.escape, self.keywords)))
         
-        # Load existing metadata
+        # Scraped URLs come from the URL index; the full metadata is only
+        # loaded once there is something to merge into it
+        self.substack_key = self.base_substack_url.rstrip('/')
         self.existing_urls = self.get_existing_urls()
+        self._journal_fd = None
         
-        # Get all post URLs
+        # Get all post URLs once; analysis and scraping both reuse this list
         self.post_urls = self.get_all_post_urls()
 
+    def close(self) -> None:
+        """
+        Release the scraper's HTTP connections
+        """
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    @staticmethod
+    def load_essays_metadata() -> dict:
+        """
+        Load the consolidated essays metadata, replaying any essays journaled
+        by a run that did not get to write the consolidated file
+        """
+        try:
+            with open(ESSAYS_METADATA_FILE, 'rb') as f:
+                all_metadata = orjson.loads(f.read())
+        except (FileNotFoundError, orjson.JSONDecodeError):
+            all_metadata = {}
+
+        journaled = {}
+        try:
+            with open(ESSAYS_METADATA_JOURNAL, 'rb') as f:
+                for line in f:
+                    try:
+                        entry = orjson.loads(line)
+                    except orjson.JSONDecodeError:
+                        continue  # Line cut short by a crash
+                    journaled.setdefault(entry['substack'], []).append(entry['essay'])
+        except FileNotFoundError:
+            pass
+
+        for substack_key, essays_data in journaled.items():
+            BaseSubstackScraper.merge_essays(all_metadata, substack_key, essays_data)
+
+        return all_metadata
+
+    @cached_property
+    def all_metadata(self) -> dict:
+        """Essays metadata for every Substack, loaded on first use"""
+        return self.load_essays_metadata()
+
     def get_existing_urls(self) -> set:
-        """Get set of URLs that have already been scraped"""
+        """
+        Get set of URLs that have already been scraped, reading the URL index
+        when it is at least as new as the metadata and rebuilding it otherwise
+        """
         try:
-            with open(ESSAYS_METADATA_FILE, 'r', encoding='utf-8') as f:
-                metadata = json.load(f)
-                # Get URLs for this Substack
-                substack_data = metadata.get(self.base_substack_url.rstrip('/'), [])
-                return {essay['url'] for essay in substack_data}
-        except (FileNotFoundError, json.JSONDecodeError):
-            return set()
+            index_mtime = os.path.getmtime(ESSAYS_URL_INDEX)
+            if not os.path.exists(ESSAYS_METADATA_FILE) or index_mtime >= os.path.getmtime(ESSAYS_METADATA_FILE):
+                with open(ESSAYS_URL_INDEX, 'r', encoding='utf-8') as f:
+                    return set(f.read().splitlines())
+        except OSError:
+            pass
+
+        urls = {
+            essay['url']
+            for essays in self.all_metadata.values()
+            for essay in essays
+        }
+        self.write_url_index(urls)
+        return urls
+
+    @staticmethod
+    def write_url_index(urls) -> None:
+        """
+        Rewrites the URL index from scratch
+        """
+        os.makedirs(os.path.dirname(ESSAYS_URL_INDEX), exist_ok=True)
+        tmp_path = f"{ESSAYS_URL_INDEX}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(''.join(f"{url}\n" for url in urls))
+        os.replace(tmp_path, ESSAYS_URL_INDEX)
 
     def analyze_scraping_task(self) -> tuple:
         """
         Analyze what needs to be scraped
         Returns (total_posts, already_scraped, to_scrape)
         """
-        all_urls = set(self.get_all_post_urls())
+        all_urls = set(self.post_urls)
         already_scraped = all_urls.intersection(self.existing_urls)
         to_scrape = all_urls - already_scraped
         
@@ -87,71 +245,64 @@ class BaseSubstackScraper(ABC):
     def get_all_post_urls(self) -> List[str]:
         """
         Attempts to fetch URLs from sitemap.xml, falling back to feed.xml if necessary.
+        Duplicate URLs are dropped, keeping the first occurrence.
         """
         urls = self.fetch_urls_from_sitemap()
         if not urls:
             urls = self.fetch_urls_from_feed()
-        return self.filter_urls(urls, self.keywords)
+        return list(dict.fromkeys(self.filter_urls(urls, self._keyword_re)))
 
     def fetch_urls_from_sitemap(self) -> List[str]:
         """
-        Fetches URLs from sitemap.xml with retry logic
+        Fetches URLs from sitemap.xml; retries are handled by the session
         """
         sitemap_url = f"{self.base_substack_url}sitemap.xml"
         
-        for attempt in range(self.max_retries):
-            try:
-                response = requests.get(sitemap_url)
-                if response.ok:
-                    root = ET.fromstring(response.content)
-                    urls = [element.text for element in root.iter('{http://www.sitemaps.org/schemas/sitemap/0.9}loc')]
-                    return urls
-                
-            except Exception as e:
-                if attempt == self.max_retries - 1:
-                    logging.error(f'Error fetching sitemap at {sitemap_url}: {e}')
-                    return []
-                    
-                logging.warning(f'Attempt {attempt + 1} failed, retrying in {self.retry_delay} seconds...')
-                sleep(self.retry_delay)
+        try:
+            response = self.session.get(sitemap_url, timeout=30)
+            if response.ok:
+                # Stream <loc> elements, freeing each once its text is read
+                urls = []
+                for _, element in etree.iterparse(io.BytesIO(response.content), tag=SITEMAP_LOC_TAG):
+                    urls.append(element.text)
+                    element.clear()
+                return urls
+            
+        except Exception as e:
+            logging.error(f'Error fetching sitemap at {sitemap_url}: {e}')
         
         return []
 
     def fetch_urls_from_feed(self) -> List[str]:
         """
-        Fetches URLs from feed.xml with retry logic
+        Fetches URLs from feed.xml; retries are handled by the session
         """
         print('Falling back to feed.xml. This will only contain up to the 22 most recent posts.')
         feed_url = f"{self.base_substack_url}feed.xml"
         
-        for attempt in range(self.max_retries):
-            try:
-                response = requests.get(feed_url)
-                if response.ok:
-                    root = ET.fromstring(response.content)
-                    urls = []
-                    for item in root.findall('.//item'):
-                        link = item.find('link')
-                        if link is not None and link.text:
-                            urls.append(link.text)
-                    return urls
-                    
-            except Exception as e:
-                if attempt == self.max_retries - 1:
-                    print(f'Error fetching feed at {feed_url}: {e}')
-                    return []
-                    
-                print(f'Attempt {attempt + 1} failed, retrying in {self.retry_delay} seconds...')
-                sleep(self.retry_delay)
+        try:
+            response = self.session.get(feed_url, timeout=30)
+            if response.ok:
+                urls = []
+                for _, item in etree.iterparse(io.BytesIO(response.content), tag='item'):
+                    link = item.findtext('link')
+                    if link:
+                        urls.append(link)
+                    item.clear()
+                return urls
+                
+        except Exception as e:
+            print(f'Error fetching feed at {feed_url}: {e}')
         
         return []
 
     @staticmethod
-    def filter_urls(urls: List[str], keywords: List[str]) -> List[str]:
+    def filter_urls(urls: List[str], keyword_re: Pattern) -> List[str]:
         """
-        This method filters out URLs that contain certain keywords
+        This method filters out URLs that contain certain keywords,
+        given as a single compiled alternation
         """
-        return [url for url in urls if all(keyword not in url for keyword in keywords)]
+        return [url for url in urls if not keyword_re.search(url)]
 
     @staticmethod
     def html_to_md(html_content: str) -> str:
@@ -160,10 +311,7 @@ class BaseSubstackScraper(ABC):
         """
         if not isinstance(html_content, str):
             raise ValueError("html_content must be a string")
-        h = html2text.HTML2Text()
-        h.ignore_links = False
-        h.body_width = 0
-        return h.handle(html_content)
+        return _get_html2text().handle(html_content)
 
     @staticmethod
     def save_to_file(filepath: str, content: str) -> None:
@@ -188,7 +336,7 @@ class BaseSubstackScraper(ABC):
         """
         This method converts Markdown to HTML
         """
-        return markdown.markdown(md_content, extensions=['extra'])
+        return _MARKDOWN.render(md_content)
 
 
     def save_to_html_file(self, filepath: str, content: str) -> None:
@@ -206,25 +354,9 @@ class BaseSubstackScraper(ABC):
         css_path = os.path.relpath("./assets/css/essay-styles.css", html_dir)
         css_path = css_path.replace("\\", "/")  # Ensure forward slashes for web paths
 
-        html_content = f"""
-            <!DOCTYPE html>
-            <html lang="en">
-            <head>
-                <meta charset="UTF-8">
-                <meta name="viewport" content="width=device-width, initial-scale=1.0">
-                <title>Markdown Content</title>
-                <link rel="stylesheet" href="{css_path}">
-            </head>
-            <body>
-                <main class="markdown-content">
-                {content}
-                </main>
-            </body>
-            </html>
-        """
-
-        with open(filepath, 'w', encoding='utf-8') as file:
-            file.write(html_content)
+        header = _HTML_HEADER.replace(b"__CSS_PATH__", css_path.encode('utf-8'))
+        with open(filepath, 'wb') as file:
+            file.write(header + content.encode('utf-8') + _HTML_FOOTER)
 
     @staticmethod
     def get_filename_from_url(url: str, filetype: str = ".md") -> str:
@@ -240,7 +372,7 @@ class BaseSubstackScraper(ABC):
         if not filetype.startswith("."):
             filetype = f".{filetype}"
 
-        return url.split("/")[-1] + filetype
+        return url.rpartition("/")[2] + filetype
 
     @staticmethod
     def combine_metadata_and_content(title: str, subtitle: str, date: str, like_count: str, content) -> str:
@@ -261,75 +393,118 @@ class BaseSubstackScraper(ABC):
 
         return metadata + content
 
-    def extract_post_data(self, soup: BeautifulSoup) -> Tuple[str, str, str, str, str]:
+    def extract_post_data(self, tree: LexborHTMLParser) -> Tuple[str, str, str, str, str, str]:
         """
-        Converts substack post soup to markdown, returns metadata and content
+        Converts substack post tree to markdown, returns metadata, the markdown
+        and the source content HTML
         """
-        title = soup.select_one("h1.post-title, h2").text.strip()  # When a video is present, the title is demoted to h2
+        title, subtitle, like_count, date, content = self.extract_post_fields(tree)
+        md_content = convert_post(title, subtitle, date, like_count, content)
+        return title, subtitle, like_count, date, md_content, content
 
-        subtitle_element = soup.select_one("h3.subtitle")
-        subtitle = subtitle_element.text.strip() if subtitle_element else ""
+    def extract_post_fields(self, tree: LexborHTMLParser) -> Tuple[str, str, str, str, str]:
+        """
+        Extracts the post metadata and the source content HTML from the tree
+        """
+        title = tree.css_first("h1.post-title, h2").text().strip()  # When a video is present, the title is demoted to h2
+
+        subtitle_element = tree.css_first("h3.subtitle")
+        subtitle = subtitle_element.text().strip() if subtitle_element is not None else ""
 
         
-        date_element = soup.find(
-            "div",
-            class_="pencraft pc-reset color-pub-secondary-text-hGQ02T line-height-20-t4M0El font-meta-MWBumP size-11-NuY2Zx weight-medium-fw81nC transform-uppercase-yKDgcq reset-IxiVJZ meta-EgzBVA"
+        date_element = tree.css_first(
+            'div[class="pencraft pc-reset color-pub-secondary-text-hGQ02T line-height-20-t4M0El font-meta-MWBumP size-11-NuY2Zx weight-medium-fw81nC transform-uppercase-yKDgcq reset-IxiVJZ meta-EgzBVA"]'
         )
-        date = date_element.text.strip() if date_element else "Date not found"
+        date = date_element.text().strip() if date_element is not None else "Date not found"
 
-        like_count_element = soup.select_one("a.post-ufi-button .label")
-        like_count = (
-            like_count_element.text.strip()
-            if like_count_element and like_count_element.text.strip().isdigit()
-            else "0"
-        )
+        like_count_element = tree.css_first("a.post-ufi-button .label")
+        like_text = like_count_element.text().strip() if like_count_element is not None else ""
+        like_count = like_text if like_text.isdigit() else "0"
 
-        content = str(soup.select_one("div.available-content"))
-        md = self.html_to_md(content)
-        md_content = self.combine_metadata_and_content(title, subtitle, date, like_count, md)
-        return title, subtitle, like_count, date, md_content
+        content = tree.css_first("div.available-content").html
+        return title, subtitle, like_count, date, content
 
     @abstractmethod
     def get_url_soup(self, url: str) -> str:
         raise NotImplementedError
 
+    def fetch_soup(self, url: str) -> Optional[LexborHTMLParser]:
+        """
+        Calls get_url_soup from a worker thread, logging errors and returning None
+        """
+        self.rate_limiter.acquire()
+        try:
+            with _HOST_LIMITER.for_url(url):
+                return self.get_url_soup(url)
+        except Exception as e:
+            logging.error(f"Error fetching {url}: {e}")
+            return None
+
+    @staticmethod
+    def merge_essays(all_metadata: dict, substack_key: str, essays_data: list) -> None:
+        """
+        Adds essays to the metadata for one Substack in place, skipping any
+        whose URL is already recorded
+        """
+        existing_essays = all_metadata.setdefault(substack_key, [])
+        seen_urls = {essay['url'] for essay in existing_essays}
+        for essay in essays_data:
+            if essay['url'] not in seen_urls:
+                seen_urls.add(essay['url'])
+                existing_essays.append(essay)
+
     def save_essays_data_to_json(self, essays_data: list) -> None:
         """
-        Saves essays data to a consolidated JSON file
+        Records a batch of newly scraped essays in memory and appends them to
+        the journal, so they survive a crash before write_essays_metadata runs
         """
-        if not os.path.exists(os.path.dirname(ESSAYS_METADATA_FILE)):
-            os.makedirs(os.path.dirname(ESSAYS_METADATA_FILE))
+        # The journal fd stays open for the whole run; each batch is a single
+        # O_APPEND write, and nothing is fsynced until the metadata is written
+        if self._journal_fd is None:
+            os.makedirs(os.path.dirname(ESSAYS_METADATA_JOURNAL), exist_ok=True)
+            self._journal_fd = os.open(ESSAYS_METADATA_JOURNAL, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
 
-        # Load existing metadata
-        all_metadata = {}
-        if os.path.exists(ESSAYS_METADATA_FILE):
-            with open(ESSAYS_METADATA_FILE, 'r', encoding='utf-8') as f:
-                all_metadata = json.load(f)
-        
-        # Update metadata for this Substack
-        substack_key = self.base_substack_url.rstrip('/')
-        existing_essays = all_metadata.get(substack_key, [])
-        
-        # Add new essays, avoiding duplicates
-        updated_essays = existing_essays + [
-            essay for essay in essays_data 
-            if essay not in existing_essays
-        ]
-        
-        # Update the metadata
-        all_metadata[substack_key] = updated_essays
-        
-        # Save updated metadata
-        with open(ESSAYS_METADATA_FILE, 'w', encoding='utf-8') as f:
-            json.dump(all_metadata, f, ensure_ascii=False, indent=4)
+        os.write(self._journal_fd, b"".join(
+            orjson.dumps({"substack": self.substack_key, "essay": essay}) + b"\n"
+            for essay in essays_data
+        ))
+
+        with open(ESSAYS_URL_INDEX, 'a', encoding='utf-8') as f:
+            f.write(''.join(f"{essay['url']}\n" for essay in essays_data))
+
+        self.merge_essays(self.all_metadata, self.substack_key, essays_data)
+
+    def write_essays_metadata(self) -> None:
+        """
+        Writes the consolidated essays metadata file and clears the journal
+        """
+        os.makedirs(os.path.dirname(ESSAYS_METADATA_FILE), exist_ok=True)
+
+        # Swapped in atomically so the file is never half-written; this is the
+        # only fsync of the run, and the journal is dropped once it lands
+        atomic_write(ESSAYS_METADATA_FILE, orjson.dumps(self.all_metadata, option=orjson.OPT_INDENT_2))
+
+        # Rewritten after the metadata so the index stays the newer file
+        self.write_url_index(
+            essay['url']
+            for essays in self.all_metadata.values()
+            for essay in essays
+        )
+
+        if self._journal_fd is not None:
+            os.close(self._journal_fd)
+            self._journal_fd = None
+        if os.path.exists(ESSAYS_METADATA_JOURNAL):
+            os.remove(ESSAYS_METADATA_JOURNAL)
 
     def scrape_posts(self, num_posts_to_scrape: int = 0) -> None:
         """
-        Scrape posts with initial analysis and batch processing.
-        Only count successfully processed posts towards batch size.
+        Scrape posts with initial analysis and batch processing. URLs are
+        split into fixed batches of batch_size, with a delay between batches;
+        only successfully saved posts count as processed.
         """
-        # Get all URLs first
-        all_urls = self.get_all_post_urls()
+        # URLs were fetched when the scraper was created
+        all_urls = self.post_urls
         total_posts, already_scraped, to_scrape = self.analyze_scraping_task()
         
         logging.info(f"\nScraping analysis for {self.base_substack_url}:")
@@ -350,50 +525,73 @@ class BaseSubstackScraper(ABC):
         if num_posts_to_scrape:
             urls_to_process = urls_to_process[:num_posts_to_scrape]
 
-        essays_data = []
+        # One directory read instead of a stat() per URL
+        existing_md_files = {entry.name for entry in os.scandir(self.md_save_dir)}
+        
+        # Output paths are built by concatenation onto these prefixes
+        md_prefix = os.path.join(self.md_save_dir, "")
+        html_prefix = os.path.join(self.html_save_dir, "")
+        
         processed = 0
-        url_index = 0
+        total_batches = (len(urls_to_process) + self.batch_size - 1) // self.batch_size
         
-        while url_index < len(urls_to_process):
-            batch_processed = 0
-            batch_urls = []
-            
-            # Process until we get batch_size successful posts or run out of URLs
-            while batch_processed < self.batch_size and url_index < len(urls_to_process):
-                url = urls_to_process[url_index]
-                batch_urls.append(url)
-                url_index += 1
+        # Fetching is network-bound, so each batch is fetched concurrently;
+        # markdown conversion is CPU-bound and goes to a process pool as posts
+        # arrive, while extraction and saving stay on this thread
+        with ThreadPoolExecutor(max_workers=self.fetch_workers) as executor, \
+                ProcessPoolExecutor(max_workers=CONVERT_WORKERS, mp_context=_CONVERT_CONTEXT) as convert_pool:
+            for batch_start in range(0, len(urls_to_process), self.batch_size):
+                batch_urls = urls_to_process[batch_start:batch_start + self.batch_size]
+                batch_num = batch_start // self.batch_size + 1
+                essays_data = []
                 
-            batch_num = (processed // self.batch_size) + 1
-            total_batches = (to_scrape + self.batch_size - 1) // self.batch_size
-            
-            logging.info(f"\nProcessing batch {batch_num}/{total_batches}")
-            
-            for url in tqdm(batch_urls, desc=f"Batch {batch_num}/{total_batches}"):
-                try:
-                    md_filename = self.get_filename_from_url(url, filetype=".md")
-                    html_filename = self.get_filename_from_url(url, filetype=".html")
-                    md_filepath = os.path.join(self.md_save_dir, md_filename)
-                    html_filepath = os.path.join(self.html_save_dir, html_filename)
-
-                    if not os.path.exists(md_filepath):
-                        soup = self.get_url_soup(url)
-                        if soup is None:
-                            logging.warning(f"Skipping {url} - could not get content")
-                            sleep(1)  # Brief pause after failed attempt
-                            continue
-                        
+                logging.info(f"\nProcessing batch {batch_num}/{total_batches}")
+                
+                # Only fetch posts that are not already on disk
+                pending_urls = []
+                for url in batch_urls:
+                    md_filename = url.rpartition("/")[2] + ".md"
+                    if md_filename in existing_md_files:
+                        logging.debug(f"File already exists: {md_prefix}{md_filename}")
+                    else:
+                        pending_urls.append(url)
+                
+                soups = executor.map(self.fetch_soup, pending_urls)
+                converting = []
+                for url, soup in tqdm(zip(pending_urls, soups), total=len(pending_urls),
+                                      desc=f"Batch {batch_num}/{total_batches}"):
+                    if soup is None:
+                        logging.warning(f"Skipping {url} - could not get content")
+                        continue
+
+                    try:
+                        title, subtitle, like_count, date, content_html = self.extract_post_fields(soup)
+                        md_future = convert_pool.submit(convert_post, title, subtitle, date, like_count, content_html)
+                    except Exception as e:
+                        logging.error(f"Failed to extract data from {url}: {e}")
+                        continue
+                    converting.append((url, title, subtitle, like_count, date, content_html, md_future))
+
+                for url, title, subtitle, like_count, date, content_html, md_future in converting:
+                    try:
+                        # Same naming as get_filename_from_url, split once per URL
+                        base_name = url.rpartition("/")[2]
+                        md_filename = base_name + ".md"
+                        md_filepath = md_prefix + md_filename
+                        html_filepath = html_prefix + base_name + ".html"
+
                         try:
-                            title, subtitle, like_count, date, md = self.extract_post_data(soup)
+                            md = md_future.result()
                         except Exception as e:
-                            logging.error(f"Failed to extract data from {url}: {e}")
-                            sleep(1)
+                            logging.error(f"Failed to convert {url}: {e}")
                             continue
                             
                         try:
                             self.save_to_file(md_filepath, md)
-                            html_content = self.md_to_html(md)
-                            self.save_to_html_file(html_filepath, html_content)
+                            # Save the source HTML rather than rendering the markdown
+                            # back to HTML; only the short metadata header is rendered
+                            header = self.combine_metadata_and_content(title, subtitle, date, like_count, "")
+                            self.save_to_html_file(html_filepath, self.md_to_html(header) + content_html)
                         except Exception as e:
                             logging.error(f"Failed to save files for {url}: {e}")
                             # Clean up any partially written files
@@ -412,29 +610,26 @@ class BaseSubstackScraper(ABC):
                             "html_file": html_filepath
                         })
                         
+                        existing_md_files.add(md_filename)
                         logging.info(f"Saved: {title} ({date})")
                         processed += 1
-                        batch_processed += 1
                         
-                        # Small delay between successful posts
-                        sleep(0.5)
-                        
-                    else:
-                        logging.debug(f"File already exists: {md_filepath}")
-                    
-                except Exception as e:
-                    logging.error(f"Error scraping {url}: {e}")
-                    sleep(1)  # Brief pause after any error
-            
-            # Save progress and delay after each batch
-            if essays_data:
-                self.save_essays_data_to_json(essays_data)
-            
-            if url_index < len(urls_to_process):
-                delay = random.uniform(self.min_batch_delay, self.max_batch_delay)
-                remaining = len(urls_to_process) - url_index
-                logging.info(f"Batch complete. {remaining} posts remaining. Sleeping for {delay:.1f} seconds...")
-                sleep(delay)
+                    except Exception as e:
+                        logging.error(f"Error scraping {url}: {e}")
+                
+                # Journal progress and delay after each batch
+                if essays_data:
+                    self.save_essays_data_to_json(essays_data)
+                
+                remaining = len(urls_to_process) - (batch_start + len(batch_urls))
+                if remaining:
+                    delay = random.uniform(self.min_batch_delay, self.max_batch_delay)
+                    logging.info(f"Batch complete. {remaining} posts remaining. Sleeping for {delay:.1f} seconds...")
+                    sleep(delay)
+
+        # Consolidate everything journaled during this run
+        if processed:
+            self.write_essays_metadata()
 
         logging.info(f"\nCompleted scraping for {self.base_substack_url}")
         logging.info(f"Successfully processed {processed} posts")
@@ -18,6 +18,10 @@ BASE_HTML_DIR = os.path.join(STORAGE_ROOT, "inbox/substacks")
 JSON_DATA_DIR = os.path.join(STORAGE_ROOT, "metadata/substacks")
 METADATA_FILE = os.path.join(JSON_DATA_DIR, "tracked_substacks.json")
 ESSAYS_METADATA_FILE = os.path.join(JSON_DATA_DIR, "essays_metadata.json")
+# Essays saved since ESSAYS_METADATA_FILE was last written, one JSON object per line
+ESSAYS_METADATA_JOURNAL = os.path.join(JSON_DATA_DIR, "essays_metadata.jsonl")
+# Every scraped essay URL, one per line, so startup doesn't parse the metadata
+ESSAYS_URL_INDEX = os.path.join(JSON_DATA_DIR, "essays_urls.idx")
 
 # Credentials
 EMAIL = os.getenv('SUBSTACK_EMAIL')
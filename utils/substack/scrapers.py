@@ -1,106 +1,135 @@
 from typing import Optional
 import logging
-from time import sleep
 import requests
-from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options as ChromiumOptions
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
 from webdriver_manager.chrome import ChromeDriverManager
 
 from .base_scraper import BaseSubstackScraper
 from .config import EMAIL, PASSWORD
 
+# Chromedriver path resolved by webdriver_manager, looked up once per process
+_DRIVER_PATH: Optional[str] = None
+
+def get_driver_path() -> str:
+    """
+    Resolves the chromedriver executable on first use and reuses it afterwards
+    """
+    global _DRIVER_PATH
+    if _DRIVER_PATH is None:
+        _DRIVER_PATH = ChromeDriverManager().install()
+    return _DRIVER_PATH
+
+# Requests Chrome drops before they leave the browser: media, fonts and
+# analytics beacons the scraper never reads. Stylesheets are left alone so
+# the login form lays out normally.
+BLOCKED_URL_PATTERNS = [
+    "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.svg",
+    "*.woff", "*.woff2", "*.mp4",
+    "*google-analytics.com*", "*googletagmanager.com*",
+]
+
+# Longest wait for a login page step, or for a manual CAPTCHA to be completed
+LOGIN_TIMEOUT = 30
+
+# Longest wait for an article's content once the DOM is ready
+CONTENT_TIMEOUT = 10
+
+# Article bodies are read in chunks of this size so paywalled pages can be
+# dropped as soon as the paywall heading arrives
+STREAM_CHUNK_SIZE = 16384
+PAYWALL_MARKER = b"paywall-title"
+
+# Browser-like headers sent with every article request
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+}
+
 class SubstackScraper(BaseSubstackScraper):
-    def __init__(self, base_substack_url: str, md_save_dir: str, html_save_dir: str):
-        super().__init__(base_substack_url, md_save_dir, html_save_dir)
+    SESSION_HEADERS = HEADERS
 
-    def get_url_soup(self, url: str) -> Optional[BeautifulSoup]:
+    def get_url_soup(self, url: str) -> Optional[LexborHTMLParser]:
         """
-        Gets soup from URL using requests with retries and better error handling
+        Gets a parsed Lexbor tree from URL over the scraper's keep-alive
+        session, which retries failed requests with backoff. The body is
+        streamed, and paywalled articles are abandoned mid-download.
         """
         try:
-            # Add headers to look more like a browser
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Connection': 'keep-alive',
-            }
-            
-            # Try up to 3 times with increasing delays
-            for attempt in range(3):
-                try:
-                    response = requests.get(url, headers=headers, timeout=10)
+            try:
+                with self.session.get(url, timeout=10, stream=True) as response:
                     response.raise_for_status()
-                    
-                    soup = BeautifulSoup(response.content, "html.parser")
-                    
-                    # Check for paywall
-                    if soup.find("h2", class_="paywall-title"):
-                        logging.info(f"Skipping premium article: {url}")
-                        return None
-                        
-                    # Check if we got a valid article
-                    content = soup.select_one("div.available-content")
-                    if not content:
-                        logging.warning(f"No content found for {url}")
-                        return None
-                        
-                    return soup
-                    
-                except requests.RequestException as e:
-                    if attempt == 2:  # Last attempt
-                        logging.error(f"Failed to fetch {url} after 3 attempts: {e}")
-                        return None
-                    sleep_time = (attempt + 1) * 2
-                    logging.warning(f"Attempt {attempt + 1} failed, retrying in {sleep_time}s...")
-                    sleep(sleep_time)
+                    body = bytearray()
+                    for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+                        # Only search the new bytes, plus enough overlap for a
+                        # marker split across chunks
+                        scan_from = max(0, len(body) - len(PAYWALL_MARKER))
+                        body += chunk
+                        # The marker can also appear in inline styles or
+                        # scripts, so confirm the heading itself has arrived
+                        if body.find(PAYWALL_MARKER, scan_from) >= 0 and \
+                                LexborHTMLParser(bytes(body)).css_first("h2.paywall-title") is not None:
+                            logging.info(f"Skipping premium article: {url}")
+                            return None
+            except requests.RequestException as e:
+                logging.error(f"Failed to fetch {url}: {e}")
+                return None
+            
+            tree = LexborHTMLParser(bytes(body))
+            
+            # Paywall heading that was still incomplete when its marker arrived
+            if tree.css_first("h2.paywall-title") is not None:
+                logging.info(f"Skipping premium article: {url}")
+                return None
+                
+            # Check if we got a valid article
+            if tree.css_first("div.available-content") is None:
+                logging.warning(f"No content found for {url}")
+                return None
+                
+            return tree
                     
         except Exception as e:
             logging.error(f"Unexpected error fetching {url}: {e}")
             return None
     
-    def extract_post_data(self, soup: BeautifulSoup) -> tuple[str, str, str, str, str]:
+    def extract_post_fields(self, tree: LexborHTMLParser) -> tuple[str, str, str, str, str]:
         """
-        Converts substack post soup to markdown with better error handling
+        Extracts the post metadata and the source content HTML from the tree,
+        with better error handling
         """
         try:
             # Title might be in different places
-            title_elem = soup.select_one("h1.post-title, h2.post-title, h1, h2")
-            if not title_elem:
+            title_elem = tree.css_first("h1.post-title, h2.post-title, h1, h2")
+            if title_elem is None:
                 raise ValueError("Could not find title")
-            title = title_elem.text.strip()
+            title = title_elem.text().strip()
 
             # Subtitle is optional
-            subtitle_element = soup.select_one("h3.subtitle")
-            subtitle = subtitle_element.text.strip() if subtitle_element else ""
+            subtitle_element = tree.css_first("h3.subtitle")
+            subtitle = subtitle_element.text().strip() if subtitle_element is not None else ""
 
             # Date might be in different places
-            date_element = soup.find(
-                "div",
-                class_=lambda x: x and all(c in x for c in ["pencraft", "color-pub-secondary-text"])
-            )
-            date = date_element.text.strip() if date_element else "Date not found"
+            date_element = tree.css_first('div[class*="pencraft"][class*="color-pub-secondary-text"]')
+            date = date_element.text().strip() if date_element is not None else "Date not found"
 
             # Likes are optional
-            like_count_element = soup.select_one("a.post-ufi-button .label")
-            like_count = (
-                like_count_element.text.strip()
-                if like_count_element and like_count_element.text.strip().isdigit()
-                else "0"
-            )
+            like_count_element = tree.css_first("a.post-ufi-button .label")
+            like_text = like_count_element.text().strip() if like_count_element is not None else ""
+            like_count = like_text if like_text.isdigit() else "0"
 
             # Content is required
-            content_elem = soup.select_one("div.available-content")
-            if not content_elem:
+            content_elem = tree.css_first("div.available-content")
+            if content_elem is None:
                 raise ValueError("Could not find content")
-            content = str(content_elem)
-            
-            md = self.html_to_md(content)
-            md_content = self.combine_metadata_and_content(title, subtitle, date, like_count, md)
-            return title, subtitle, like_count, date, md_content
+            return title, subtitle, like_count, date, content_elem.html
 
         except Exception as e:
             logging.error(f"Error extracting post data: {e}")
@@ -112,7 +141,7 @@ class PremiumSubstackScraper(BaseSubstackScraper):
             base_substack_url: str,
             md_save_dir: str,
             html_save_dir: str,
-            headless: bool = False,
+            headless: bool = True,
             chromium_binary: str = '/Applications/Chromium.app/Contents/MacOS/Chromium',
             chromium_driver_path: str = '',
             user_agent: str = ''
@@ -123,8 +152,14 @@ class PremiumSubstackScraper(BaseSubstackScraper):
             md_save_dir=md_save_dir,
             html_save_dir=html_save_dir
         )
+        # One WebDriver session can only load one page at a time
+        self.fetch_workers = 1
 
         options = ChromiumOptions()
+        # driver.get returns at DOMContentLoaded; the article markup is
+        # complete by then, so there is no need to wait out trackers and embeds
+        options.page_load_strategy = "eager"
+        # Headless by default; pass headless=False to watch the browser or solve a CAPTCHA
         if headless:
             options.add_argument("--headless=new")
         
@@ -141,13 +176,29 @@ class PremiumSubstackScraper(BaseSubstackScraper):
         options.add_experimental_option("excludeSwitches", ["enable-automation"])
         options.add_experimental_option('useAutomationExtension', False)
 
+        # Only the article text is scraped, so skip image decoding and other
+        # background work
+        options.add_argument('--blink-settings=imagesEnabled=false')
+        options.add_argument('--disable-extensions')
+        options.add_argument('--disable-background-networking')
+        options.add_argument('--disable-sync')
+        options.add_argument('--mute-audio')
+        options.add_argument('--window-size=1280,800')
+        options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.managed_default_content_settings.plugins": 2,
+            "profile.managed_default_content_settings.popups": 2,
+        })
+
         if chromium_driver_path:
             service = Service(executable_path=chromium_driver_path)
         else:
-            service = Service(ChromeDriverManager().install())
+            service = Service(executable_path=get_driver_path())
 
         self.driver = webdriver.Chrome(service=service, options=options)
         self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        self.driver.execute_cdp_cmd("Network.enable", {})
+        self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
         self.login()
 
     def login(self) -> None:
@@ -155,18 +206,17 @@ class PremiumSubstackScraper(BaseSubstackScraper):
         Login method using XPath selectors. May require manual CAPTCHA completion.
         """
         try:
+            wait = WebDriverWait(self.driver, LOGIN_TIMEOUT)
             self.driver.get("https://substack.com/sign-in")
             logging.info("Loaded sign-in page")
-            sleep(3)
 
-            signin_with_password = self.driver.find_element(
-                By.XPATH, "//a[@class='login-option substack-login__login-option']"
-            )
+            signin_with_password = wait.until(EC.element_to_be_clickable(
+                (By.XPATH, "//a[@class='login-option substack-login__login-option']")
+            ))
             signin_with_password.click()
             logging.info("Clicked 'Sign in with password'")
-            sleep(3)
 
-            email = self.driver.find_element(By.NAME, "email")
+            email = wait.until(EC.element_to_be_clickable((By.NAME, "email")))
             password = self.driver.find_element(By.NAME, "password")
             
             email.send_keys(EMAIL)
@@ -179,8 +229,17 @@ class PremiumSubstackScraper(BaseSubstackScraper):
             submit.click()
             logging.info("Clicked submit")
             
-            logging.warning("If a CAPTCHA appears, please complete it manually within the next 30 seconds...")
-            sleep(30)  # Wait for potential manual CAPTCHA completion
+            logging.warning(f"If a CAPTCHA appears, please complete it manually within the next {LOGIN_TIMEOUT} seconds...")
+            # Return as soon as the login lands or is rejected, instead of
+            # always waiting out the CAPTCHA window
+            try:
+                wait.until(EC.any_of(
+                    EC.url_contains("/home"),
+                    EC.presence_of_element_located((By.CSS_SELECTOR, "nav.navbar-logged-in")),
+                    EC.visibility_of_element_located((By.ID, "error-container")),
+                ))
+            except TimeoutException:
+                logging.warning("Timed out waiting for login to complete")
 
             if self.is_login_failed():
                 raise Exception("Login failed - please check if CAPTCHA needs completing")
@@ -191,13 +250,27 @@ class PremiumSubstackScraper(BaseSubstackScraper):
             logging.error(f"Login failed: {e}")
             raise
 
+    def close(self) -> None:
+        """
+        Quits the browser along with the HTTP session
+        """
+        self.driver.quit()
+        super().close()
+
     def is_login_failed(self) -> bool:
         error_container = self.driver.find_elements(By.ID, 'error-container')
         return len(error_container) > 0 and error_container[0].is_displayed()
 
-    def get_url_soup(self, url: str) -> BeautifulSoup:
+    def get_url_soup(self, url: str) -> LexborHTMLParser:
         try:
             self.driver.get(url)
-            return BeautifulSoup(self.driver.page_source, "html.parser")
+            try:
+                WebDriverWait(self.driver, CONTENT_TIMEOUT).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, "div.available-content"))
+                )
+            except TimeoutException:
+                logging.warning(f"No content rendered for {url}")
+            # page_source is already a str; hand it straight to Lexbor
+            return LexborHTMLParser(self.driver.page_source)
         except Exception as e:
             raise ValueError(f"Error fetching page: {e}") from e
\ No newline at end of file
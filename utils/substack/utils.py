@@ -1,7 +1,13 @@
-from urllib.parse import urlparse
+from functools import lru_cache
 
+@lru_cache(maxsize=4096)
 def extract_main_part(url: str) -> str:
-    parts = urlparse(url).netloc.split('.')
-    return parts[1] if parts[0] == 'www' else parts[0]
+    # Slice the host out directly rather than running a full urlparse
+    start = url.find('://')
+    start = 0 if start < 0 else start + 3
+    end = url.find('/', start)
+    host = url[start:end] if end >= 0 else url[start:]
+    first, _, rest = host.partition('.')
+    return rest.split('.', 1)[0] if first == 'www' else first
 
 # Add other utility functions here
@@ -1,6 +1,21 @@
 # utils/text/processors.py
 import re
+from functools import lru_cache
 from typing import Dict, Set, Tuple
+import pandas as pd
+
+# Patterns compiled once at import; these functions run for every entity mention
+_WS_RE = re.compile(r'\s+')
+_RE_LEAD_ART = re.compile(r'^(the|a|an)\s+', re.IGNORECASE)
+_RE_POSSESS_END = re.compile(r"'s$")
+_RE_PLURAL_POSSESS = re.compile(r"s'$")
+_RE_SUFFIX_OWN = re.compile(r"'s\s+(own|part|share|portion|division|subsidiary|segment)$", re.IGNORECASE)
+# Possessives anywhere and a trailing corporate suffix (with possessives on
+# either side of its period), stripped in one pass
+_RE_NORM = re.compile(r"'s?\b|(?<!\w')\b(?:inc|corp|corporation|ltd|limited|llc|llp|lp|plc)\b(?:'s?\b)*\.?(?:'s?\b)*$")
+
+# Quotes and punctuation trimmed from the ends of cleaned entities
+_PUNCT_STRIP = '"\'.,;:()[]{}'
 
 def clean_entity_text(text: str) -> str:
     """
@@ -13,26 +28,30 @@ def clean_entity_text(text: str) -> str:
         Cleaned entity text
     """
     # Convert to single space and strip
-    text = ' '.join(text.split())
+    text = _WS_RE.sub(' ', text).strip()
     
     # Remove leading articles (the, a, an)
-    text = re.sub(r'^(the|a|an)\s+', '', text, flags=re.IGNORECASE)
+    text = _RE_LEAD_ART.sub('', text)
     
     # Handle possessives
-    text = re.sub(r"'s$", '', text)  # Remove 's at the end
-    text = re.sub(r"s'$", 's', text)  # Handle plural possessives
+    text = _RE_POSSESS_END.sub('', text)  # Remove 's at the end
+    text = _RE_PLURAL_POSSESS.sub('s', text)  # Handle plural possessives
     
     # Remove common suffixes that might appear in financial docs
-    text = re.sub(r"'s\s+(own|part|share|portion|division|subsidiary|segment)$", '', text, flags=re.IGNORECASE)
+    text = _RE_SUFFIX_OWN.sub('', text)
     
     # Remove quotes and other common punctuation at ends
-    text = text.strip('"\'.,;:()[]{}')
+    text = text.strip(_PUNCT_STRIP)
     
     return text.strip()
 
+@lru_cache(maxsize=1 << 17)
 def normalize_entity(entity_text: str) -> str:
     """
-    Normalize entity text for comparison purposes.
+    Normalize entity text for comparison purposes. Results are memoized,
+    since the same mentions are compared many times; call
+    normalize_entity.cache_clear() to release the cache in long-running
+    processes.
     
     Args:
         entity_text: Raw entity text
@@ -40,19 +59,20 @@ def normalize_entity(entity_text: str) -> str:
     Returns:
         Normalized (lowercase, stripped) entity text
     """
-    # Convert to lowercase for comparison
-    text = entity_text.lower()
-    
-    # Remove all possessive forms
-    text = re.sub(r"'s?\b", '', text)
-    
-    # Remove common corporate suffixes
-    text = re.sub(r'\b(inc|corp|corporation|ltd|limited|llc|llp|lp|plc)\b\.?$', '', text)
-    
-    # Remove multiple spaces and trim
-    text = ' '.join(text.split())
+    # Lowercase, drop possessives and corporate suffixes, collapse whitespace
+    return ' '.join(_RE_NORM.sub('', entity_text.lower()).split())
+
+def normalize_entity_batch(series: pd.Series) -> pd.Series:
+    """
+    Vectorized normalize_entity over a whole column of entity texts.
     
-    return text.strip()
+    Args:
+        series: Raw entity texts
+        
+    Returns:
+        Normalized entity texts, index-aligned with the input
+    """
+    return series.str.lower().str.replace(_RE_NORM, '', regex=True).str.split().str.join(' ')
 
 def entities_match(entity1: str, entity2: str) -> bool:
     """